@@ -81,7 +81,8 @@ func main() {
 		gin.SetMode(gin.ReleaseMode)
 	}
 	logger.SetMode(*mode)
-	defer logger.Sync()
+	// 退出时刷新日志缓冲区并停止其后台刷新协程
+	defer logger.Stop()
 
 	initModels()
 	initStreamController()
@@ -5,10 +5,13 @@ import (
 	"code-completion/pkg/config"
 	"context"
 	"encoding/json"
+	"errors"
 	"fmt"
 	"io"
 	"net/http"
 	"net/url"
+	"strconv"
+	"strings"
 
 	"go.uber.org/zap"
 )
@@ -33,6 +36,7 @@ func NewAPIClient() *APIClient {
 }
 
 // RequestParam 请求参数
+// GET请求的查询串由queryValues手工构建，增删字段或修改json标签时需同步更新queryValues
 type RequestParam struct {
 	ClientID       string  `json:"clientId"`
 	CodebasePath   string  `json:"codebasePath"`
@@ -50,36 +54,63 @@ type RequestParam struct {
 // ResponseData 响应数据结构
 type ResponseData struct {
 	Data struct {
-		List []map[string]interface{} `json:"list"`
+		List []*ResponseItem `json:"list"`
 	} `json:"data"`
 }
 
-func kvs2UrlValues(kvs map[string]interface{}) url.Values {
+// listItemFieldPrefix 检索条目字段在json.UnmarshalTypeError.Field中的路径前缀
+const listItemFieldPrefix = "data.list."
+
+// ResponseItem 检索结果条目，只解码解析时用到的字段
+// 字段类型不符时按零值处理，与原先从map中取值的行为一致
+type ResponseItem struct {
+	FilePath string  `json:"filePath"`
+	Name     string  `json:"name"`
+	Content  string  `json:"content"`
+	Type     string  `json:"type"`
+	Score    float64 `json:"score"`
+}
+
+// queryValues 直接由请求参数构建GET查询串，字段名与omitempty规则同json标签一致
+// 数值沿用原先JSON往返后按%f格式化的写法，保持请求格式不变
+func (p *RequestParam) queryValues() url.Values {
 	values := url.Values{}
-	for key, value := range kvs {
-		switch v := value.(type) {
-		case string:
-			values.Add(key, v)
-		case int, int8, int16, int32, int64:
-			values.Add(key, fmt.Sprintf("%d", v))
-		case float32, float64:
-			values.Add(key, fmt.Sprintf("%f", v))
-		case bool:
-			values.Add(key, fmt.Sprintf("%t", v))
-		case []interface{}:
-			// 处理数组类型
-			for _, item := range v {
-				values.Add(key, fmt.Sprintf("%v", item))
-			}
-		default:
-			if value != nil {
-				values.Add(key, fmt.Sprintf("%v", value))
-			}
-		}
+	values.Set("clientId", p.ClientID)
+	values.Set("codebasePath", p.CodebasePath)
+	if p.FilePath != "" {
+		values.Set("filePath", p.FilePath)
+	}
+	if p.CodeSnippet != "" {
+		values.Set("codeSnippet", p.CodeSnippet)
+	}
+	if p.StartLine != 0 {
+		values.Set("startLine", formatQueryNumber(float64(p.StartLine)))
+	}
+	if p.EndLine != 0 {
+		values.Set("endLine", formatQueryNumber(float64(p.EndLine)))
+	}
+	if p.Query != "" {
+		values.Set("query", p.Query)
+	}
+	if p.TopK != 0 {
+		values.Set("topK", formatQueryNumber(float64(p.TopK)))
+	}
+	if p.ScoreThreshold != 0 {
+		values.Set("scoreThreshold", formatQueryNumber(p.ScoreThreshold))
+	}
+	if p.MaxLayer != 0 {
+		values.Set("maxLayer", formatQueryNumber(float64(p.MaxLayer)))
+	}
+	if p.IncludeContent {
+		values.Set("includeContent", "true")
 	}
 	return values
 }
 
+func formatQueryNumber(v float64) string {
+	return strconv.FormatFloat(v, 'f', 6, 64)
+}
+
 func headers2zapAny(headers http.Header) map[string]interface{} {
 	headerMap := make(map[string]interface{})
 	for key, values := range headers {
@@ -91,35 +122,32 @@ func headers2zapAny(headers http.Header) map[string]interface{} {
 // doRequest 发送HTTP请求
 func (c *APIClient) DoRequest(ctx context.Context, requestURL string, params RequestParam, headers http.Header, method string) (*ResponseData, error) {
 	var req *http.Request
-	body, err := json.Marshal(params)
-	if err != nil {
-		zap.L().Warn("Failed to marshal request params", zap.Error(err), zap.String("url", requestURL))
-		return nil, err
-	}
+	var body []byte
+	var err error
 	if method == "POST" {
-		req, err = http.NewRequestWithContext(ctx, method, requestURL, bytes.NewBuffer(body))
-	} else {
-		var paramsMap map[string]interface{}
-		if err := json.Unmarshal(body, &paramsMap); err != nil {
-			zap.L().Warn("Failed to unmarshal params for query", zap.Error(err), zap.String("url", requestURL))
+		body, err = json.Marshal(params)
+		if err != nil {
+			zap.L().Warn("Failed to marshal request params", zap.Error(err), zap.String("url", requestURL))
 			return nil, err
 		}
-		query := kvs2UrlValues(paramsMap)
-		rawUrl := requestURL
-		if len(query) > 0 {
-			rawUrl = requestURL + "?" + query.Encode()
-		}
-		req, err = http.NewRequestWithContext(ctx, method, rawUrl, nil)
+		req, err = http.NewRequestWithContext(ctx, method, requestURL, bytes.NewBuffer(body))
+	} else {
+		// GET请求直接构建查询串，无需先序列化为JSON再反序列化为map
+		query := params.queryValues().Encode()
+		body = []byte(query)
+		req, err = http.NewRequestWithContext(ctx, method, requestURL+"?"+query, nil)
 	}
 	if err != nil {
 		zap.L().Warn("Failed to create request", zap.Error(err), zap.String("url", requestURL))
 		return nil, err
 	}
-	// 设置请求头,只包含这几个
-	req.Header.Set("X-Request-Id", headers.Get("X-Request-Id"))
-	req.Header.Set("Authorization", headers.Get("Authorization"))
-	req.Header.Set("X-Costrict-Version", headers.Get("X-Costrict-Version"))
-	req.Header.Set("Content-Type", "application/json")
+	// 设置请求头,只包含这几个；键名已是规范形式，一次性构建，无需逐个Set
+	req.Header = http.Header{
+		"X-Request-Id":       {headers.Get("X-Request-Id")},
+		"Authorization":      {headers.Get("Authorization")},
+		"X-Costrict-Version": {headers.Get("X-Costrict-Version")},
+		"Content-Type":       {"application/json"},
+	}
 
 	resp, err := c.client.Do(req)
 	if err != nil {
@@ -142,8 +170,14 @@ func (c *APIClient) DoRequest(ctx context.Context, requestURL string, params Req
 	}
 	var result ResponseData
 	if err := json.NewDecoder(resp.Body).Decode(&result); err != nil {
-		zap.L().Warn("Failed to decode response", zap.Error(err), zap.String("url", requestURL))
-		return nil, err
+		// 检索条目中个别字段类型不符时其余字段仍已解码，该字段保留零值
+		// data、list或条目本身的结构不符仍按解码失败处理
+		var typeErr *json.UnmarshalTypeError
+		if !errors.As(err, &typeErr) || !strings.HasPrefix(typeErr.Field, listItemFieldPrefix) {
+			zap.L().Warn("Failed to decode response", zap.Error(err), zap.String("url", requestURL))
+			return nil, err
+		}
+		zap.L().Debug("Ignore mismatched response item field", zap.Error(err), zap.String("url", requestURL))
 	}
 	return &result, nil
 }
@@ -0,0 +1,143 @@
+package codebase_context
+
+import (
+	"context"
+	"encoding/json"
+	"fmt"
+	"io"
+	"net/http"
+	"net/url"
+	"reflect"
+	"strings"
+	"testing"
+)
+
+// jsonQueryValues 按JSON往返的旧方式构建查询串，作为queryValues的对照
+func jsonQueryValues(t *testing.T, p RequestParam) url.Values {
+	body, err := json.Marshal(p)
+	if err != nil {
+		t.Fatalf("json.Marshal: %v", err)
+	}
+	var kvs map[string]interface{}
+	if err := json.Unmarshal(body, &kvs); err != nil {
+		t.Fatalf("json.Unmarshal: %v", err)
+	}
+	values := url.Values{}
+	for key, value := range kvs {
+		switch v := value.(type) {
+		case string:
+			values.Add(key, v)
+		case float64:
+			values.Add(key, fmt.Sprintf("%f", v))
+		case bool:
+			values.Add(key, fmt.Sprintf("%t", v))
+		default:
+			t.Fatalf("unexpected json value type %T for %s", value, key)
+		}
+	}
+	return values
+}
+
+func Test_queryValuesMatchesJSON(t *testing.T) {
+	cases := []struct {
+		name  string
+		param RequestParam
+	}{
+		{"zero", RequestParam{}},
+		{"snippet", RequestParam{ClientID: "c1", CodebasePath: "/repo", FilePath: "a.go", CodeSnippet: "func main() {}", StartLine: 3, EndLine: 9}},
+		{"query", RequestParam{ClientID: "c2", CodebasePath: "/repo", Query: "x y&z", TopK: 5, ScoreThreshold: 0.35}},
+		{"relation", RequestParam{ClientID: "c3", FilePath: "b.go", MaxLayer: 2, IncludeContent: true, StartLine: -1}},
+	}
+	for _, c := range cases {
+		got := c.param.queryValues()
+		want := jsonQueryValues(t, c.param)
+		if !reflect.DeepEqual(got, want) {
+			t.Errorf("%s: queryValues() = %v, want %v", c.name, got, want)
+		}
+	}
+}
+
+// Test_queryValuesCoversJSONTags 逐个字段设置非零值，确认RequestParam新增字段时queryValues同步更新
+func Test_queryValuesCoversJSONTags(t *testing.T) {
+	typ := reflect.TypeOf(RequestParam{})
+	for i := 0; i < typ.NumField(); i++ {
+		field := typ.Field(i)
+		name, opts, _ := strings.Cut(field.Tag.Get("json"), ",")
+		if name == "" || name == "-" {
+			continue
+		}
+		var p RequestParam
+		v := reflect.ValueOf(&p).Elem().Field(i)
+		switch v.Kind() {
+		case reflect.String:
+			v.SetString("v")
+		case reflect.Int:
+			v.SetInt(7)
+		case reflect.Float64:
+			v.SetFloat(0.5)
+		case reflect.Bool:
+			v.SetBool(true)
+		default:
+			t.Fatalf("field %s: unsupported kind %s", field.Name, v.Kind())
+		}
+		got := p.queryValues()
+		want := jsonQueryValues(t, p)
+		if !got.Has(name) {
+			t.Errorf("field %s: queryValues() missing key %q", field.Name, name)
+		}
+		if !reflect.DeepEqual(got, want) {
+			t.Errorf("field %s (%q): queryValues() = %v, want %v", field.Name, opts, got, want)
+		}
+	}
+}
+
+// fakeHTTPClient 对任何请求都返回固定响应体的HTTP客户端
+type fakeHTTPClient struct {
+	body string
+}
+
+func (f *fakeHTTPClient) Do(req *http.Request) (*http.Response, error) {
+	return &http.Response{
+		StatusCode: http.StatusOK,
+		Body:       io.NopCloser(strings.NewReader(f.body)),
+	}, nil
+}
+
+func Test_DoRequestDecodeTolerance(t *testing.T) {
+	cases := []struct {
+		body     string
+		wantErr  bool
+		items    int
+		filePath string // 第一个条目的filePath
+	}{
+		{`{"data":{"list":[{"filePath":"a.go","name":"f","score":0.5}]}}`, false, 1, "a.go"},
+		{`{"data":{"list":[{"filePath":"a.go","name":1}]}}`, false, 1, "a.go"},
+		{`{"data":{"list":[{"filePath":"b.go","score":"high"},{"name":"g"}]}}`, false, 2, "b.go"},
+		{`{"data":{"list":[]}}`, false, 0, ""},
+		{`{"data":[]}`, true, 0, ""},
+		{`{"data":1}`, true, 0, ""},
+		{`{"data":{"list":{}}}`, true, 0, ""},
+		{`{"data":{"list":[1]}}`, true, 0, ""},
+		{`{"data":{"list":["x"]}}`, true, 0, ""},
+		{`[]`, true, 0, ""},
+		{`{"data":`, true, 0, ""},
+	}
+	for _, c := range cases {
+		client := &APIClient{client: &fakeHTTPClient{body: c.body}}
+		data, err := client.DoRequest(context.Background(), "http://localhost/search", RequestParam{}, http.Header{}, "GET")
+		if (err != nil) != c.wantErr {
+			t.Errorf("DoRequest(%s) error = %v, wantErr %v", c.body, err, c.wantErr)
+			continue
+		}
+		if err != nil {
+			continue
+		}
+		if len(data.Data.List) != c.items {
+			t.Errorf("DoRequest(%s) items = %d, want %d", c.body, len(data.Data.List), c.items)
+			continue
+		}
+		if c.items > 0 && data.Data.List[0].FilePath != c.filePath {
+			t.Errorf("DoRequest(%s) filePath = %q, want %q", c.body, data.Data.List[0].FilePath, c.filePath)
+		}
+	}
+}
@@ -3,7 +3,6 @@ package codebase_context
 import (
 	"code-completion/pkg/config"
 	"context"
-	"fmt"
 	"net/http"
 	"path/filepath"
 	"strings"
@@ -41,6 +40,31 @@ type SearchResult struct {
 	RelationResults   []*ResponseData
 }
 
+// searchSlots 并行检索的结果槽位，检索协程的写入与汇总时的读取由锁保护
+// 超时返回后仍在进行的检索可能继续写入，汇总只读取当时的快照
+type searchSlots struct {
+	mutex sync.Mutex
+	slots []*ResponseData
+}
+
+func newSearchSlots(n int) *searchSlots {
+	return &searchSlots{slots: make([]*ResponseData, n)}
+}
+
+// 写入第idx个检索结果
+func (s *searchSlots) set(idx int, data *ResponseData) {
+	s.mutex.Lock()
+	defer s.mutex.Unlock()
+	s.slots[idx] = data
+}
+
+// 返回当前已写入结果的副本，之后的写入不影响返回值
+func (s *searchSlots) snapshot() []*ResponseData {
+	s.mutex.Lock()
+	defer s.mutex.Unlock()
+	return append([]*ResponseData(nil), s.slots...)
+}
+
 /**
  * Asynchronously search for code definitions
  * @param {context.Context} ctx - Context for request cancellation and timeout
@@ -50,24 +74,24 @@ type SearchResult struct {
  * @param {string} codeSnippet - Code snippet to search for definitions
  * @param {http.Header} headers - HTTP headers for the request
  * @param {sync.WaitGroup} wg - Wait group for synchronization
- * @param {[]*ResponseData} results - Slice to store search results
- * @param {int} idx - Index in results slice to store the result
+ * @param {*searchSlots} results - Result slots shared with RequestContext
+ * @param {int} idx - Index of the slot to store the result
  * @description
  * - Performs asynchronous definition search for code snippet
- * - Updates results slice at specified index with search result
- * - Handles errors by storing error result in results slice
+ * - Stores the search result in the slot at the specified index
+ * - Leaves the slot nil on error so callers only see successful results
  * - Signals completion via done() on wait group
  * @example
  * wg.Add(1)
  * go client.searchDefinitionAsync(ctx, "client-id", "/codebase", "file.go", "func test()", headers, &wg, results, 0)
  */
 func (c *ContextClient) searchDefinitionAsync(ctx context.Context, clientID, codebasePath, filePath, codeSnippet string,
-	headers http.Header, wg *sync.WaitGroup, results []*ResponseData, idx int) {
+	headers http.Header, wg *sync.WaitGroup, results *searchSlots, idx int) {
 	defer wg.Done()
 
 	data, err := c.searchDefinition(ctx, clientID, codebasePath, filePath, codeSnippet, headers)
-	if err != nil {
-		results[idx] = data
+	if err == nil {
+		results.set(idx, data)
 	}
 }
 
@@ -80,24 +104,24 @@ func (c *ContextClient) searchDefinitionAsync(ctx context.Context, clientID, cod
  * @param {string} codeSnippet - Code snippet to search for relations
  * @param {http.Header} headers - HTTP headers for the request
  * @param {sync.WaitGroup} wg - Wait group for synchronization
- * @param {[]*ResponseData} results - Slice to store search results
- * @param {int} idx - Index in results slice to store the result
+ * @param {*searchSlots} results - Result slots shared with RequestContext
+ * @param {int} idx - Index of the slot to store the result
  * @description
  * - Performs asynchronous relation search for code snippet
- * - Updates results slice at specified index with search result
- * - Handles errors by storing error result in results slice
+ * - Stores the search result in the slot at the specified index
+ * - Leaves the slot nil on error so callers only see successful results
  * - Signals completion via done() on wait group
  * @example
  * wg.Add(1)
  * go client.searchRelationAsync(ctx, "client-id", "/codebase", "file.go", "func test()", headers, &wg, results, 1)
  */
 func (c *ContextClient) searchRelationAsync(ctx context.Context, clientID, codebasePath, filePath, codeSnippet string,
-	headers http.Header, wg *sync.WaitGroup, results []*ResponseData, idx int) {
+	headers http.Header, wg *sync.WaitGroup, results *searchSlots, idx int) {
 	defer wg.Done()
 
 	data, err := c.searchRelation(ctx, clientID, codebasePath, filePath, codeSnippet, headers)
-	if err != nil {
-		results[idx] = data
+	if err == nil {
+		results.set(idx, data)
 	}
 }
 
@@ -109,24 +133,24 @@ func (c *ContextClient) searchRelationAsync(ctx context.Context, clientID, codeb
  * @param {string} query - Semantic query string to search for
  * @param {http.Header} headers - HTTP headers for the request
  * @param {sync.WaitGroup} wg - Wait group for synchronization
- * @param {[]*ResponseData} results - Slice to store search results
- * @param {int} idx - Index in results slice to store the result
+ * @param {*searchSlots} results - Result slots shared with RequestContext
+ * @param {int} idx - Index of the slot to store the result
  * @description
  * - Performs asynchronous semantic search for code
- * - Updates results slice at specified index with search result
- * - Handles errors by storing error result in results slice
+ * - Stores the search result in the slot at the specified index
+ * - Leaves the slot nil on error so callers only see successful results
  * - Signals completion via done() on wait group
  * @example
  * wg.Add(1)
  * go client.searchSemanticAsync(ctx, "client-id", "/codebase", "database query", headers, &wg, results, 2)
  */
 func (c *ContextClient) searchSemanticAsync(ctx context.Context, clientID, codebasePath, query string, headers http.Header,
-	wg *sync.WaitGroup, results []*ResponseData, idx int) {
+	wg *sync.WaitGroup, results *searchSlots, idx int) {
 	defer wg.Done()
 
 	data, err := c.searchSemantic(ctx, clientID, codebasePath, query, headers)
-	if err != nil {
-		results[idx] = data
+	if err == nil {
+		results.set(idx, data)
 	}
 }
 
@@ -162,9 +186,9 @@ func (c *ContextClient) RequestContext(ctx context.Context, clientID, codebasePa
 
 	var wg sync.WaitGroup
 	// 初始化结果数组
-	definitionResults := make([]*ResponseData, len(codeSnippets))
-	relationResults := make([]*ResponseData, len(codeSnippets))
-	semanticResults := make([]*ResponseData, len(queries))
+	definitionResults := newSearchSlots(len(codeSnippets))
+	relationResults := newSearchSlots(len(codeSnippets))
+	semanticResults := newSearchSlots(len(queries))
 
 	// 定义检索
 	if len(codeSnippets) > 0 && !config.Context.Definition.Disabled {
@@ -212,9 +236,9 @@ func (c *ContextClient) RequestContext(ctx context.Context, clientID, codebasePa
 		zap.L().Warn("Context timeout, returning partial results", zap.Error(ctx.Err()))
 	}
 	return &SearchResult{
-		DefinitionResults: definitionResults,
-		SemanticResults:   semanticResults,
-		RelationResults:   relationResults,
+		DefinitionResults: definitionResults.snapshot(),
+		SemanticResults:   semanticResults.snapshot(),
+		RelationResults:   relationResults.snapshot(),
 	}
 }
 
@@ -223,6 +247,12 @@ func (c *ContextClient) GetContext(ctx context.Context, clientID, projectPath, f
 	if clientID == "" || projectPath == "" || filePath == "" || (prefix == "" && suffix == "") {
 		return ""
 	}
+	// 检索条件只为启用的检索类型构建，全部禁用时不做任何处理
+	needSnippet := !config.Context.Definition.Disabled || !config.Context.Relation.Disabled
+	needQuery := !config.Context.Semantic.Disabled
+	if !needSnippet && !needQuery {
+		return ""
+	}
 
 	// 构建完整文件路径
 	fullFilePath := filepath.Join(projectPath, filePath)
@@ -233,15 +263,19 @@ func (c *ContextClient) GetContext(ctx context.Context, clientID, projectPath, f
 	}
 
 	// 获取语义搜索内容（前缀最后几行）
-	semanticSearchContent := rSliceAfterNthInstance(prefix, "\n", 4)
+	var semanticQueries []string
+	if needQuery {
+		semanticQueries = []string{rSliceAfterNthInstance(prefix, "\n", 4)}
+	}
 
-	// 定义检索代码片段
-	definitionCodeSnaps := []string{
-		fmt.Sprintf("%s%s%s", importContent, prefix, suffix),
+	// 定义检索代码片段，拼接整个文件内容，只在定义或关系检索启用时构建
+	var definitionCodeSnaps []string
+	if needSnippet {
+		definitionCodeSnaps = []string{importContent + prefix + suffix}
 	}
 
 	searchResult := c.RequestContext(ctx, clientID, projectPath, fullFilePath,
-		definitionCodeSnaps, []string{semanticSearchContent}, headers)
+		definitionCodeSnaps, semanticQueries, headers)
 
 	// 解析语义检索结果
 	semanticCodes := parseSemantic(searchResult.SemanticResults)
@@ -252,7 +286,8 @@ func (c *ContextClient) GetContext(ctx context.Context, clientID, projectPath, f
 	// 解析关系检索结果
 	relationCodes := parseRelation(searchResult.RelationResults)
 
-	var allCodes []string
+	// 每条结果贡献路径和内容两项，一次分配好容量，避免逐条追加时反复扩容
+	allCodes := make([]string, 0, 2*(len(defCodes)+len(semanticCodes)+len(relationCodes)))
 
 	// 合并定义检索结果
 	for _, item := range defCodes {
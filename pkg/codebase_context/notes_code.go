@@ -8,164 +8,68 @@ import (
 // CommentFunc 注释函数类型
 type CommentFunc func(string) string
 
-// commentWithHash 适用于 # 注释风格的语言
-func commentWithHash(code string) string {
+// commentLines 逐行添加注释前后缀，空白行输出为空行；结果直接写入预分配的缓冲区，不生成中间行切片
+func commentLines(code, prefix, suffix string) string {
 	if code == "" {
 		return ""
 	}
 
-	lines := strings.Split(code, "\n")
-	var result []string
-
-	for _, line := range lines {
-		if strings.TrimSpace(line) == "" {
-			result = append(result, "")
-		} else {
-			result = append(result, "# "+line)
+	var sb strings.Builder
+	sb.Grow(len(code) + (strings.Count(code, "\n")+1)*(len(prefix)+len(suffix)))
+	for {
+		line, rest, more := strings.Cut(code, "\n")
+		if strings.TrimSpace(line) != "" {
+			sb.WriteString(prefix)
+			sb.WriteString(line)
+			sb.WriteString(suffix)
 		}
+		if !more {
+			break
+		}
+		sb.WriteByte('\n')
+		code = rest
 	}
+	return sb.String()
+}
 
-	return strings.Join(result, "\n")
+// commentWithHash 适用于 # 注释风格的语言
+func commentWithHash(code string) string {
+	return commentLines(code, "# ", "")
 }
 
 // commentWithSlash 适用于 // 注释风格的语言
 func commentWithSlash(code string) string {
-	if code == "" {
-		return ""
-	}
-
-	lines := strings.Split(code, "\n")
-	var result []string
-
-	for _, line := range lines {
-		if strings.TrimSpace(line) == "" {
-			result = append(result, "")
-		} else {
-			result = append(result, "// "+line)
-		}
-	}
-
-	return strings.Join(result, "\n")
+	return commentLines(code, "// ", "")
 }
 
 // commentWithDash 适用于 Lua 的 -- 注释风格
 func commentWithDash(code string) string {
-	if code == "" {
-		return ""
-	}
-
-	lines := strings.Split(code, "\n")
-	var result []string
-
-	for _, line := range lines {
-		if strings.TrimSpace(line) == "" {
-			result = append(result, "")
-		} else {
-			result = append(result, "-- "+line)
-		}
-	}
-
-	return strings.Join(result, "\n")
+	return commentLines(code, "-- ", "")
 }
 
 // commentWithDoubleDash 适用于 SQL、Haskell 等使用 '--' 的语言
 func commentWithDoubleDash(code string) string {
-	if code == "" {
-		return ""
-	}
-
-	lines := strings.Split(code, "\n")
-	var result []string
-
-	for _, line := range lines {
-		if strings.TrimSpace(line) == "" {
-			result = append(result, "")
-		} else {
-			result = append(result, "-- "+line)
-		}
-	}
-
-	return strings.Join(result, "\n")
+	return commentLines(code, "-- ", "")
 }
 
 // commentWithDoubleHash 适用于 Dockerfile 使用 ## 注释（虽非标准）
 func commentWithDoubleHash(code string) string {
-	if code == "" {
-		return ""
-	}
-
-	lines := strings.Split(code, "\n")
-	var result []string
-
-	for _, line := range lines {
-		if strings.TrimSpace(line) == "" {
-			result = append(result, "")
-		} else {
-			result = append(result, "## "+line)
-		}
-	}
-
-	return strings.Join(result, "\n")
+	return commentLines(code, "## ", "")
 }
 
 // commentWithExclamation 适用于 Batch 文件使用 @REM 注释
 func commentWithExclamation(code string) string {
-	if code == "" {
-		return ""
-	}
-
-	lines := strings.Split(code, "\n")
-	var result []string
-
-	for _, line := range lines {
-		if strings.TrimSpace(line) == "" {
-			result = append(result, "")
-		} else {
-			result = append(result, "@REM "+line)
-		}
-	}
-
-	return strings.Join(result, "\n")
+	return commentLines(code, "@REM ", "")
 }
 
 // commentWithPercent 适用于 TeX/LaTeX 注释 %
 func commentWithPercent(code string) string {
-	if code == "" {
-		return ""
-	}
-
-	lines := strings.Split(code, "\n")
-	var result []string
-
-	for _, line := range lines {
-		if strings.TrimSpace(line) == "" {
-			result = append(result, "")
-		} else {
-			result = append(result, "% "+line)
-		}
-	}
-
-	return strings.Join(result, "\n")
+	return commentLines(code, "% ", "")
 }
 
 // commentWithSemicolon 适用于 Lisp、Prolog、INI 等用 ; 注释的语言
 func commentWithSemicolon(code string) string {
-	if code == "" {
-		return ""
-	}
-
-	lines := strings.Split(code, "\n")
-	var result []string
-
-	for _, line := range lines {
-		if strings.TrimSpace(line) == "" {
-			result = append(result, "")
-		} else {
-			result = append(result, "; "+line)
-		}
-	}
-
-	return strings.Join(result, "\n")
+	return commentLines(code, "; ", "")
 }
 
 // commentWithStar 适用于多行注释风格如 /* ... */ 的语言（简单前缀添加）
@@ -179,22 +83,7 @@ func commentWithStar(code string) string {
 
 // commentWithMarkdown 适用于 Markdown 等使用 Markdown 语法的语言
 func commentWithMarkdown(code string) string {
-	if code == "" {
-		return ""
-	}
-
-	lines := strings.Split(code, "\n")
-	var result []string
-
-	for _, line := range lines {
-		if strings.TrimSpace(line) == "" {
-			result = append(result, "")
-		} else {
-			result = append(result, "<!-- "+line+" -->")
-		}
-	}
-
-	return strings.Join(result, "\n")
+	return commentLines(code, "<!-- ", " -->")
 }
 
 // defaultCommenter 默认处理函数
@@ -277,12 +166,9 @@ func getComment(filePath string, code string) string {
 
 	ext := filepath.Ext(filePath)
 	if ext == "" {
-		// 如果没有扩展名，尝试从文件名中提取
-		if strings.Contains(filePath, ".") {
-			parts := strings.Split(filePath, ".")
-			if len(parts) > 1 {
-				ext = "." + parts[len(parts)-1]
-			}
+		// 如果没有扩展名，尝试从文件名中提取（取最后一个'.'之后的部分）
+		if i := strings.LastIndexByte(filePath, '.'); i >= 0 {
+			ext = filePath[i:]
 		}
 	}
 
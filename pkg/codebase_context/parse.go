@@ -1,7 +1,6 @@
 package codebase_context
 
 import (
-	"fmt"
 	"sort"
 )
 
@@ -47,19 +46,16 @@ func parseSemantic(data []*ResponseData) []ParsedSemanticResult {
 			}
 
 			// 获取相似代码信息
-			content := getStringValue(semantic, "content")
+			content := semantic.Content
 			if content == "" || contextSet[content] {
 				continue
 			}
 
 			contextSet[content] = true
-			filePath := getStringValue(semantic, "filePath")
-			score := getFloat64Value(semantic, "score")
-
 			result = append(result, ParsedSemanticResult{
-				FilePath: filePath,
+				FilePath: semantic.FilePath,
 				Content:  content,
-				Score:    score,
+				Score:    semantic.Score,
 			})
 		}
 	}
@@ -78,6 +74,12 @@ func parseSemantic(data []*ResponseData) []ParsedSemanticResult {
 	return result
 }
 
+// definitionKey 定义检索结果的去重键
+type definitionKey struct {
+	filePath string
+	name     string
+}
+
 // parseDefinition 解析定义检索结果
 func parseDefinition(data []*ResponseData) []ParsedDefinitionResult {
 	if len(data) == 0 {
@@ -85,7 +87,7 @@ func parseDefinition(data []*ResponseData) []ParsedDefinitionResult {
 	}
 
 	var result []ParsedDefinitionResult
-	contextSet := make(map[string]bool)
+	contextSet := make(map[definitionKey]bool)
 
 	for _, item := range data {
 		if item == nil {
@@ -98,15 +100,20 @@ func parseDefinition(data []*ResponseData) []ParsedDefinitionResult {
 				continue
 			}
 
-			// 提取filePath, name, content
-			filePath := getStringValue(defItem, "filePath")
-			name := getStringValue(defItem, "name")
-			content := getStringValue(defItem, "content")
-			defType := getStringValue(defItem, "type")
+			// 提取filePath, name，先去重，重复项无需再处理content
+			filePath := defItem.FilePath
+			name := defItem.Name
+			key := definitionKey{filePath: filePath, name: name}
+			if contextSet[key] {
+				continue
+			}
+			contextSet[key] = true
+
+			content := defItem.Content
 
 			// 根据类型处理内容
 			if content != "" {
-				switch defType {
+				switch defItem.Type {
 				case "definition.method", "definition.function", "declaration.method", "declaration.function":
 					content = sliceBeforeNthInstance(content, "\n", 20)
 				case "definition.class", "definition.struct", "declaration.struct", "declaration.class":
@@ -116,13 +123,6 @@ func parseDefinition(data []*ResponseData) []ParsedDefinitionResult {
 				}
 			}
 
-			// 去重
-			key := fmt.Sprintf("%s:%s", filePath, name)
-			if contextSet[key] {
-				continue
-			}
-
-			contextSet[key] = true
 			result = append(result, ParsedDefinitionResult{
 				Name:     name,
 				FilePath: filePath,
@@ -159,14 +159,10 @@ func parseRelation(data []*ResponseData) []ParsedRelationResult {
 				continue
 			}
 
-			filePath := getStringValue(relation, "filePath")
-			content := getStringValue(relation, "content")
-			score := getFloat64Value(relation, "score")
-
 			result = append(result, ParsedRelationResult{
-				FilePath: filePath,
-				Content:  content,
-				Score:    score,
+				FilePath: relation.FilePath,
+				Content:  relation.Content,
+				Score:    relation.Score,
 			})
 		}
 	}
@@ -184,29 +180,3 @@ func parseRelation(data []*ResponseData) []ParsedRelationResult {
 
 	return result
 }
-
-// 辅助函数
-func getStringValue(m map[string]interface{}, key string) string {
-	if val, ok := m[key]; ok {
-		if str, ok := val.(string); ok {
-			return str
-		}
-	}
-	return ""
-}
-
-func getFloat64Value(m map[string]interface{}, key string) float64 {
-	if val, ok := m[key]; ok {
-		switch v := val.(type) {
-		case float64:
-			return v
-		case float32:
-			return float64(v)
-		case int:
-			return float64(v)
-		case int64:
-			return float64(v)
-		}
-	}
-	return 0
-}
@@ -2,13 +2,16 @@ package completions
 
 import (
 	"context"
-	"fmt"
+	"errors"
 	"time"
 
 	"code-completion/pkg/config"
 	"code-completion/pkg/model"
 )
 
+// 修剪后补全内容为空时返回的固定错误
+var errEmptyCompletion = errors.New("empty")
+
 /**
  * 补全处理器结构体
  * @description
@@ -88,7 +91,7 @@ func NewCompletionHandler(m model.LLM) *CompletionHandler {
 
 func (h *CompletionHandler) Adapt(input *CompletionInput) *model.CompletionParameter {
 	// 3. 补全模型相关的前置处理 （拼接prompt策略，单行/多行补全策略，裁剪过长上下文）
-	h.truncatePrompt(h.cfg, &input.Processed)
+	promptTokens := h.truncatePrompt(h.cfg, &input.Processed)
 
 	// 4. 准备停用词，根据是否单行补全调整停用词
 	stopWords := h.prepareStopWords(input)
@@ -105,6 +108,7 @@ func (h *CompletionHandler) Adapt(input *CompletionInput) *model.CompletionParam
 	para.Stop = stopWords
 	para.MaxTokens = h.cfg.MaxOutput
 	para.Temperature = float32(input.Temperature)
+	para.PromptTokens = promptTokens
 	return &para
 }
 
@@ -130,13 +134,52 @@ func (h *CompletionHandler) Adapt(input *CompletionInput) *model.CompletionParam
  * response := handler.CallLLM(ctx, input)
  */
 func (h *CompletionHandler) CallLLM(c *CompletionContext, para *model.CompletionParameter) *CompletionResponse {
+	return h.Postprocess(c, para, h.RequestLLM(c, para))
+}
+
+// LLMResult 模型返回的原始结果，尚未修剪和统计
+type LLMResult struct {
+	rsp     *model.CompletionResponse
+	verbose *model.CompletionVerbose
+	status  model.CompletionStatus
+	err     error
+}
+
+/**
+ * 调用大模型，只获取原始结果
+ * @param {*CompletionContext} c - 补全上下文，包含请求上下文和性能统计信息
+ * @param {*model.CompletionParameter} para - 已适配模型的补全参数
+ * @returns {*LLMResult} 返回模型原始结果，需交给Postprocess生成响应
+ * @description
+ * - 只包含等待模型的部分，并记录模型耗时
+ * - 与Postprocess分开，使模型池的并发槽位在模型返回后即可释放
+ */
+func (h *CompletionHandler) RequestLLM(c *CompletionContext, para *model.CompletionParameter) *LLMResult {
 	modelStartTime := time.Now().Local()
-	rsp, verbose, completionStatus, err := h.llm.Completions(c.Ctx, para)
-	modelEndTime := time.Now().Local()
-	c.Perf.LLMDuration = modelEndTime.Sub(modelStartTime).Milliseconds()
+	rsp, verbose, status, err := h.llm.Completions(c.Ctx, para)
+	c.Perf.LLMDuration = time.Now().Local().Sub(modelStartTime).Milliseconds()
+	return &LLMResult{rsp: rsp, verbose: verbose, status: status, err: err}
+}
 
+/**
+ * 处理模型原始结果，生成补全响应
+ * @param {*CompletionContext} c - 补全上下文，包含请求上下文和性能统计信息
+ * @param {*model.CompletionParameter} para - 已适配模型的补全参数
+ * @param {*LLMResult} result - RequestLLM返回的模型原始结果
+ * @returns {*CompletionResponse} 返回补全响应对象，包含补全结果或错误信息
+ * @description
+ * - 统计token使用情况
+ * - 对补全结果进行修剪，修剪后为空返回空状态响应
+ * - 可在模型池之外的协程中执行
+ */
+func (h *CompletionHandler) Postprocess(c *CompletionContext, para *model.CompletionParameter, result *LLMResult) *CompletionResponse {
+	rsp, verbose, completionStatus, err := result.rsp, result.verbose, result.status, result.err
 	if completionStatus != model.StatusSuccess {
-		c.Perf.PromptTokens = h.getTokensCount(para.Prefix) + h.getTokensCount(para.CodeContext)
+		// 优先复用截断阶段已统计的token数，避免重复编码
+		c.Perf.PromptTokens = para.PromptTokens
+		if c.Perf.PromptTokens == 0 {
+			c.Perf.PromptTokens = h.getTokensCount(para.Prefix) + h.getTokensCount(para.CodeContext)
+		}
 		return ErrorResponse(para.CompletionID, para.Model, completionStatus, c.Perf, verbose, err)
 	}
 
@@ -154,7 +197,7 @@ func (h *CompletionHandler) CallLLM(c *CompletionContext, para *model.Completion
 	c.Perf.TotalTokens = c.Perf.CompletionTokens + c.Perf.PromptTokens
 
 	if completionText == "" {
-		return ErrorResponse(para.CompletionID, para.Model, model.StatusEmpty, c.Perf, verbose, fmt.Errorf("empty"))
+		return ErrorResponse(para.CompletionID, para.Model, model.StatusEmpty, c.Perf, verbose, errEmptyCompletion)
 	}
 
 	// 7. 构建响应
@@ -2,7 +2,7 @@ package completions
 
 import (
 	"encoding/json"
-	"fmt"
+	"errors"
 	"math"
 	"os"
 	"strings"
@@ -71,6 +71,7 @@ func NewFilterChain(cfg *config.WrapperConfig) *FilterChain {
  * @param {CompletionInput} in - Completion request data to be evaluated
  * @returns {error} Returns error if any filter rejects the request, nil if all filters accept
  * @description
+ * - Skips the filters entirely for manual/continue triggers, which every filter accepts
  * - Processes completion request through all filters in the chain
  * - Stops processing and returns error on first filter rejection
  * - Request must pass all filters to be accepted
@@ -82,14 +83,23 @@ func NewFilterChain(cfg *config.WrapperConfig) *FilterChain {
  * }
  */
 func (c *FilterChain) Handle(in *CompletionInput) error {
+	// 手动触发时所有过滤器都会放行，在循环外判断一次即可
+	if len(c.filters) == 0 || isManualTrigger(in.TriggerMode) {
+		return nil
+	}
 	for _, handler := range c.filters {
 		if rejectCode := handler.Judge(in); rejectCode != Accepted {
-			return fmt.Errorf("%s", rejectCode)
+			return errors.New(string(rejectCode))
 		}
 	}
 	return nil
 }
 
+// isManualTrigger 判断是否为手动触发或继续补全模式，忽略大小写比较，无需先转换为大写
+func isManualTrigger(mode string) bool {
+	return strings.EqualFold(mode, "MANUAL") || strings.EqualFold(mode, "CONTINUE")
+}
+
 //------------------------------------------------------------------------------
 //	CodeFilters
 //------------------------------------------------------------------------------
@@ -101,6 +111,8 @@ type CodeFilters struct {
 	FIMIndicator  string
 	EndTag        string
 	MinPromptLine int
+	endTags       []string // 解析后的EndTag，构造时解析一次
+	maxEndTagLen  int      // endTags中最长tag的字节数
 }
 
 /**
@@ -152,18 +164,24 @@ func NewSyntaxFilter(cfg *config.SyntaxFilterConfig) *CodeFilters {
  * - Creates code filters with specified configuration parameters
  * - Sets up patterns and thresholds for code completion evaluation
  * - Initializes FIM indicator for fill-in-middle completion detection
+ * - Parses end tags once so per-request checks reuse them
  * @example
  * filters := NewCodeFilters(0.3, 5, "import.*", ".*", "';','}'")
  * needCode := filters.NeedCode(request)
  */
 func NewCodeFilters(minPromptLine int, strPattern, treePattern, endTag string) *CodeFilters {
-	return &CodeFilters{
+	c := &CodeFilters{
 		StrPattern:    strPattern,
 		TreePattern:   treePattern,
 		FIMIndicator:  "<FILL_HERE>",
 		EndTag:        endTag,
 		MinPromptLine: minPromptLine,
 	}
+	c.endTags = c.parseEndTag()
+	for _, tag := range c.endTags {
+		c.maxEndTagLen = max(c.maxEndTagLen, len(tag))
+	}
+	return c
 }
 
 /**
@@ -182,15 +200,16 @@ func NewCodeFilters(minPromptLine int, strPattern, treePattern, endTag string) *
  */
 func (c *CodeFilters) Judge(in *CompletionInput) RejectCode {
 	// 跳过手动触发模式
-	mode := strings.ToUpper(in.TriggerMode)
-	if mode == "MANUAL" || mode == "CONTINUE" {
+	if isManualTrigger(in.TriggerMode) {
 		return Accepted
 	}
-	if c.cursorIsAtTheEnd(in) {
+	// 两个检查都只关心光标前后的文本，只切分一次prompt
+	textBeforeCursor, textAfterCursor := c.splitPrompt(in.Processed.Prefix)
+	if c.cursorIsAtTheEnd(textBeforeCursor, textAfterCursor) {
 		return FeatureNotSupport
 	}
 
-	if c.textAfterFillHereStartWithWord(in) {
+	if c.textAfterFillHereStartWithWord(textAfterCursor) {
 		return FeatureNotSupport
 	}
 	// 简化实现，其他复杂的过滤逻辑暂时关闭
@@ -207,11 +226,12 @@ func (c *CodeFilters) NeedCode(in *CompletionInput) bool {
 	//     return false
 	// }
 
-	if c.cursorIsAtTheEnd(in) {
+	textBeforeCursor, textAfterCursor := c.splitPrompt(in.Processed.Prefix)
+	if c.cursorIsAtTheEnd(textBeforeCursor, textAfterCursor) {
 		return false
 	}
 
-	if c.textAfterFillHereStartWithWord(in) {
+	if c.textAfterFillHereStartWithWord(textAfterCursor) {
 		return false
 	}
 
@@ -233,57 +253,68 @@ func (c *CodeFilters) NeedCode(in *CompletionInput) bool {
  * before, after := filters.splitPrompt("code before <FILL_HERE> code after")
  */
 func (c *CodeFilters) splitPrompt(prompt string) (string, string) {
-	textBeforeCursor, textAfterCursor := "", ""
-	if strings.Contains(prompt, c.FIMIndicator) {
-		parts := strings.Split(prompt, c.FIMIndicator)
-		if len(parts) >= 2 {
-			textBeforeCursor = parts[len(parts)-2]
-			textAfterCursor = parts[len(parts)-1]
-		} else {
-			textBeforeCursor = prompt
-			textAfterCursor = ""
-		}
+	// 只定位最后两个FIM标记，避免切分整个prompt
+	last := strings.LastIndex(prompt, c.FIMIndicator)
+	if last < 0 {
+		return "", ""
+	}
+	textAfterCursor := prompt[last+len(c.FIMIndicator):]
+	textBeforeCursor := prompt[:last]
+	if prev := strings.LastIndex(textBeforeCursor, c.FIMIndicator); prev >= 0 {
+		textBeforeCursor = textBeforeCursor[prev+len(c.FIMIndicator):]
 	}
 	return textBeforeCursor, textAfterCursor
 }
 
 /**
  * Check if cursor is at the end of a line
- * @param {CompletionInput} in - Completion request data containing prompt
+ * @param {string} textBeforeCursor - Text before cursor, as returned by splitPrompt
+ * @param {string} textAfterCursor - Text after cursor, as returned by splitPrompt
  * @returns {bool} Returns true if cursor is at line end, false otherwise
  * @description
- * - Splits prompt into text before and after cursor
- * - Parses end tags from configuration
+ * - Takes the prompt already split by the caller, so the prompt is scanned only once per request
+ * - Uses end tags parsed at construction time
+ * - Only compacts the tail of the text before cursor that is long enough for the longest tag
  * - Checks if text before cursor ends with any configured end tag
  * - Verifies that text after cursor starts with empty line
  * - Returns true if all conditions indicate cursor is at line end
  * @example
- * if filters.cursorIsAtTheEnd(request) {
+ * if filters.cursorIsAtTheEnd(filters.splitPrompt(request.Processed.Prefix)) {
  *     // Skip completion
  * }
  */
-func (c *CodeFilters) cursorIsAtTheEnd(in *CompletionInput) bool {
+func (c *CodeFilters) cursorIsAtTheEnd(textBeforeCursor, textAfterCursor string) bool {
 	// 光标位于有效行行尾的直接不触发补全
 	// 行尾定义：光标左侧是'>'、';'、'}'、')'，右侧是换行符号
-
-	textBeforeCursor, textAfterCursor := c.splitPrompt(in.Processed.Prefix)
 	if textBeforeCursor != "" && textAfterCursor != "" {
-		// 解析endTag
-		endTags := c.parseEndTag()
-		for _, tag := range endTags {
-			if strings.HasSuffix(strings.ReplaceAll(textBeforeCursor, " ", ""), tag) {
+		// endTag在构造时已解析；判断后缀只需去空格后的末尾maxEndTagLen个字节
+		compactBefore := compactTail(textBeforeCursor, c.maxEndTagLen)
+		for _, tag := range c.endTags {
+			if strings.HasSuffix(compactBefore, tag) {
 				// 检查右侧是否是空行
-				lines := strings.Split(textAfterCursor, "\n")
-				if len(lines) > 0 && strings.TrimSpace(lines[0]) == "" {
-					// fmt.Printf("光标位于行尾，跳过自动补全\n")
-					return true
+				firstLine := textAfterCursor
+				if i := strings.IndexByte(firstLine, '\n'); i >= 0 {
+					firstLine = firstLine[:i]
 				}
+				// fmt.Printf("光标位于行尾，跳过自动补全\n")
+				return strings.TrimSpace(firstLine) == ""
 			}
 		}
 	}
 	return false
 }
 
+// compactTail 返回text去除空格后的末尾部分，至少包含n个非空格字节（text不足时返回全部）
+func compactTail(text string, n int) string {
+	i := len(text)
+	for count := 0; i > 0 && count < n; i-- {
+		if text[i-1] != ' ' {
+			count++
+		}
+	}
+	return strings.ReplaceAll(text[i:], " ", "")
+}
+
 /**
  * Parse end tag configuration string into individual tags
  * @returns {[]string} Returns slice of parsed end tags
@@ -317,21 +348,20 @@ func (c *CodeFilters) parseEndTag() []string {
 
 /**
  * Check if text after fill position starts with a word character
- * @param {CompletionInput} in - Completion request data containing prompt
+ * @param {string} textAfterCursor - Text after cursor, as returned by splitPrompt
  * @returns {bool} Returns true if text after fill starts with word character, false otherwise
  * @description
- * - Extracts text after cursor position from prompt
  * - Checks if first character is letter (a-z, A-Z) or digit (0-9)
  * - Returns true if text after cursor starts with word character
  * - Used to skip completion when modifying variable names
  * @example
- * if filters.textAfterFillHereStartWithWord(request) {
+ * _, after := filters.splitPrompt(request.Processed.Prefix)
+ * if filters.textAfterFillHereStartWithWord(after) {
  *     // Skip completion (likely variable name modification)
  * }
  */
-func (c *CodeFilters) textAfterFillHereStartWithWord(in *CompletionInput) bool {
+func (c *CodeFilters) textAfterFillHereStartWithWord(textAfterCursor string) bool {
 	// 补全后面直接是英文字母开头或数字的不补全，比如修改变量名称的场景
-	_, textAfterCursor := c.splitPrompt(in.Processed.Prefix)
 	if textAfterCursor != "" {
 		firstChar := textAfterCursor[0]
 		if (firstChar >= 'a' && firstChar <= 'z') || (firstChar >= 'A' && firstChar <= 'Z') || (firstChar >= '0' && firstChar <= '9') {
@@ -359,14 +389,12 @@ func (c *CodeFilters) textAfterFillHereStartWithWord(in *CompletionInput) bool {
  */
 func (c *CodeFilters) tooFewLines(in *CompletionInput) bool {
 	// prompt行数太少不触发补全，排除空行场景
-	lines := strings.Split(in.Processed.Prefix, "\n")
-	nonEmptyLines := make([]string, 0)
-	for _, line := range lines {
+	lineCount := 0
+	for _, line := range strings.Split(in.Processed.Prefix, "\n") {
 		if strings.TrimSpace(line) != "" {
-			nonEmptyLines = append(nonEmptyLines, line)
+			lineCount++
 		}
 	}
-	lineCount := len(nonEmptyLines)
 	if lineCount < c.MinPromptLine {
 		// fmt.Printf("prompt行数%d小于阈值%d，跳过自动补全\n", lineCount, c.MinPromptLine)
 		return true
@@ -386,6 +414,26 @@ type HiddenScoreFilter struct {
 	ContextualFilterAcceptThreshold float64
 	ContextualFilterIntercept       float64
 	ContextualFilterCharacterMap    map[string]int
+	charWeights                     *[256]int // 由ContextualFilterCharacterMap生成的按字节索引的权重表
+}
+
+// buildCharWeights 将单字符权重映射展开为按字节索引的查找表，未配置的字符权重为0
+func buildCharWeights(charMap map[string]int) *[256]int {
+	var table [256]int
+	for char, weight := range charMap {
+		if len(char) == 1 {
+			table[char[0]] = weight
+		}
+	}
+	return &table
+}
+
+// charWeight 获取字符的权重索引，优先使用查找表
+func (h *HiddenScoreFilter) charWeight(c byte) int {
+	if h.charWeights != nil {
+		return h.charWeights[c]
+	}
+	return h.ContextualFilterCharacterMap[string([]byte{c})]
 }
 
 /**
@@ -429,8 +477,7 @@ func NewScoreFilter(cfg *config.ScoreFilterConfig) *HiddenScoreFilter {
  */
 func (h *HiddenScoreFilter) Judge(in *CompletionInput) RejectCode {
 	// 跳过手动触发和继续补全模式
-	mode := strings.ToUpper(in.TriggerMode)
-	if mode == "MANUAL" || mode == "CONTINUE" {
+	if isManualTrigger(in.TriggerMode) {
 		return Accepted
 	}
 
@@ -473,6 +520,7 @@ func loadHiddenScoreFilter(configPath string) *HiddenScoreFilter {
 	if err := json.Unmarshal(bytes, &c); err != nil {
 		return nil
 	}
+	c.charWeights = buildCharWeights(c.ContextualFilterCharacterMap)
 	return &c
 }
 
@@ -527,6 +575,7 @@ func NewHiddenScoreFilter(configPath string, thresholdScore float64) *HiddenScor
 			"$": 27, "%": 28, "^": 29, "&": 30, "|": 31, "~": 32, "`": 33,
 		},
 	}
+	filter.charWeights = buildCharWeights(filter.ContextualFilterCharacterMap)
 	filter.ThresholdScore = thresholdScore
 	return filter
 }
@@ -567,10 +616,7 @@ func (h *HiddenScoreFilter) CalculateHideScore(scores *HiddenScoreOptions, prefi
 
 	if prefixStr != "" {
 		prefixLengthLog = math.Log(1.0 + float64(h.getLastLineLength(prefixStr)))
-		prefixLastChar := prefixStr[len(prefixStr)-1:]
-		if weight, exists := h.ContextualFilterCharacterMap[prefixLastChar]; exists {
-			prefixLastCharWeight = weight
-		}
+		prefixLastCharWeight = h.charWeight(prefixStr[len(prefixStr)-1])
 	}
 
 	suffixLengthLog := 0.0
@@ -580,10 +626,7 @@ func (h *HiddenScoreFilter) CalculateHideScore(scores *HiddenScoreOptions, prefi
 	trimmedSuffixStr := strings.TrimRight(prefixStr, " \t\n\r")
 	if trimmedSuffixStr != "" {
 		suffixLengthLog = math.Log(1.0 + float64(h.getLastLineLength(trimmedSuffixStr)))
-		suffixLastChar := trimmedSuffixStr[len(trimmedSuffixStr)-1:]
-		if weight, exists := h.ContextualFilterCharacterMap[suffixLastChar]; exists {
-			suffixLastCharWeight = weight
-		}
+		suffixLastCharWeight = h.charWeight(trimmedSuffixStr[len(trimmedSuffixStr)-1])
 	}
 
 	documentLengthLog := math.Log(1.0 + math.Max(float64(scores.DocumentLength), 0.0))
@@ -599,62 +642,38 @@ func (h *HiddenScoreFilter) CalculateHideScore(scores *HiddenScoreOptions, prefi
 	// 初始值-0.3
 	score := h.ContextualFilterIntercept
 
-	// 上一个标签的权重(上一次接受的话，下一次基本都会给予补全) +0.99
-	if len(h.ContextualFilterWeights) > 0 {
-		score += h.ContextualFilterWeights[0] * float64(scores.PreviousLabel)
-	}
-
-	// 当前行光标后为空的话倾向补全 + 0.7
-	if len(h.ContextualFilterWeights) > 1 {
-		score += h.ContextualFilterWeights[1] * whitespaceAfterCursor
-	}
-
-	// 时间间隔的权重，上一次触发的时间越久越不补全 - 0.17
-	if len(h.ContextualFilterWeights) > 2 {
-		score += h.ContextualFilterWeights[2] * timeSincePreviousLabelLog
-	}
-
-	// 前缀尾行长度的权重，尾行越长越不补全 - 0.22
-	if len(h.ContextualFilterWeights) > 3 {
-		score += h.ContextualFilterWeights[3] * prefixLengthLog
-	}
-
-	// 前缀去除空行或者空格后尾行长度的权重（去除空格或空行后的尾行），后缀越长越补全 + 0.13
-	if len(h.ContextualFilterWeights) > 4 {
-		score += h.ContextualFilterWeights[4] * suffixLengthLog
-	}
-
-	// 文档长度的权重，越长越不补 - 0.007
-	if len(h.ContextualFilterWeights) > 5 {
-		score += h.ContextualFilterWeights[5] * documentLengthLog
+	// 前8个特征与权重一一对应，合并为一次点积计算
+	features := [...]float64{
+		float64(scores.PreviousLabel), // 上一个标签的权重(上一次接受的话，下一次基本都会给予补全) +0.99
+		whitespaceAfterCursor,         // 当前行光标后为空的话倾向补全 + 0.7
+		timeSincePreviousLabelLog,     // 时间间隔的权重，上一次触发的时间越久越不补全 - 0.17
+		prefixLengthLog,               // 前缀尾行长度的权重，尾行越长越不补全 - 0.22
+		suffixLengthLog,               // 前缀去除空行或者空格后尾行长度的权重，后缀越长越补全 + 0.13
+		documentLengthLog,             // 文档长度的权重，越长越不补 - 0.007
+		promptEndPosLog,               // 光标所在文档位置的权重，越靠后越补 + 0.005
+		promptEndPosRatio,             // 光标位置与文档长度的比值的权重，越靠后越补 + 0.41
 	}
-
-	// 光标所在文档位置的权重，越靠后越补 + 0.005
-	if len(h.ContextualFilterWeights) > 6 {
-		score += h.ContextualFilterWeights[6] * promptEndPosLog
-	}
-
-	// 光标位置与文档长度的比值的权重，越靠后越补 + 0.41
-	if len(h.ContextualFilterWeights) > 7 {
-		score += h.ContextualFilterWeights[7] * promptEndPosRatio
+	weights := h.ContextualFilterWeights
+	for i := 0; i < len(features) && i < len(weights); i++ {
+		score += weights[i] * features[i]
 	}
 
 	// 语言权重
 	languageWeightIndex := 8 + languageWeight
-	if len(h.ContextualFilterWeights) > int(languageWeightIndex) {
-		score += h.ContextualFilterWeights[languageWeightIndex]
+	if len(weights) > languageWeightIndex {
+		score += weights[languageWeightIndex]
 	}
 
 	// 前缀的最后一个字符的权重
 	prefixCharWeightIndex := 29 + prefixLastCharWeight
-	if len(h.ContextualFilterWeights) > int(prefixCharWeightIndex) {
-		score += h.ContextualFilterWeights[prefixCharWeightIndex]
+	if len(weights) > prefixCharWeightIndex {
+		score += weights[prefixCharWeightIndex]
 	}
 
 	// 前缀最后一个有效行的最后一个字符的权重
 	suffixCharWeightIndex := 125 + suffixLastCharWeight
-	if len(h.ContextualFilterWeights) > int(suffixCharWeightIndex) {
-		score += h.ContextualFilterWeights[suffixCharWeightIndex]
+	if len(weights) > suffixCharWeightIndex {
+		score += weights[suffixCharWeightIndex]
 	}
 
 	probabilityAccept := 1.0 / (1.0 + math.Exp(-score))
@@ -666,7 +685,7 @@ func (h *HiddenScoreFilter) CalculateHideScore(scores *HiddenScoreOptions, prefi
  * @param {string} text - Input text to analyze
  * @returns {int} Returns length of last line, 0 if text is empty
  * @description
- * - Splits text into individual lines
+ * - Scans backwards for the last newline instead of splitting the text
  * - Returns length of the last line in the text
  * - Handles empty text by returning 0
  * - Used for calculating prefix and suffix lengths in hide score calculation
@@ -675,12 +694,6 @@ func (h *HiddenScoreFilter) CalculateHideScore(scores *HiddenScoreOptions, prefi
  * // length will be 4
  */
 func (h *HiddenScoreFilter) getLastLineLength(text string) int {
-	if text == "" {
-		return 0
-	}
-	lines := strings.Split(text, "\n")
-	if len(lines) == 0 {
-		return 0
-	}
-	return len(lines[len(lines)-1])
+	// 从末尾查找最后一个换行符，无需切分整个文本
+	return len(text) - strings.LastIndexByte(text, '\n') - 1
 }
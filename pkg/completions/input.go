@@ -5,6 +5,7 @@ import (
 	"code-completion/pkg/config"
 	"code-completion/pkg/model"
 	"net/http"
+	"sync"
 	"time"
 )
 
@@ -21,7 +22,7 @@ import (
  *     Headers: http.Header{},
  * }
  * ctx := NewCompletionContext(context.Background(), &CompletionPerformance{})
- * response := input.Preprocess(ctx)
+ * response := input.Preprocess(ctx, NewCompletionHandler(nil))
  */
 type CompletionInput struct {
 	CompletionRequest               //原始请求中的BODY
@@ -33,21 +34,53 @@ type CompletionInput struct {
  * 代码上下文客户端实例
  * @description
  * - 全局单例，用于获取代码上下文信息
- * - 在GetContext方法中延迟初始化
+ * - 在GetContext方法中延迟初始化，并发请求下也只创建一次
  * - 提供代码库上下文查询功能
  * - 用于增强补全请求的上下文信息
  */
-var contextClient *codebase_context.ContextClient
+var (
+	contextClientOnce sync.Once
+	contextClient     *codebase_context.ContextClient
+)
+
+// 获取代码上下文客户端，首次调用时创建
+func getContextClient() *codebase_context.ContextClient {
+	contextClientOnce.Do(func() {
+		contextClient = codebase_context.NewContextClient()
+	})
+	return contextClient
+}
+
+/**
+ * 补全拒绝规则链实例
+ * @description
+ * - 配置在运行期间不变，规则链只需按配置构建一次
+ * - 规则链构建后不再修改，可被并发请求共享
+ */
+var (
+	filterChainOnce sync.Once
+	filterChain     *FilterChain
+)
+
+// 获取按当前配置构建的补全拒绝规则链
+func getFilterChain() *FilterChain {
+	filterChainOnce.Do(func() {
+		filterChain = NewFilterChain(config.Wrapper)
+	})
+	return filterChain
+}
 
 /**
  * 处理补全请求
  * @param {*CompletionContext} c - 补全上下文，包含请求上下文和性能统计信息
+ * @param {*CompletionHandler} h - 后续处理该请求的补全处理器，可为nil
  * @returns {*CompletionResponse} 返回补全响应对象，如果预处理失败则返回错误响应
  * @description
  * - 执行补全请求的预处理流程
  * - 首先通过过滤器链处理补全拒绝规则
  * - 如果拒绝规则匹配，返回拒绝响应
  * - 解析请求参数获取提示词
+ * - 在获取上下文期间，由补全处理器并行编码前缀和后缀
  * - 获取代码上下文信息
  * - 是补全处理的第一步
  * @throws
@@ -55,19 +88,24 @@ var contextClient *codebase_context.ContextClient
  * @example
  * input := &CompletionInput{...}
  * ctx := NewCompletionContext(context.Background(), &CompletionPerformance{})
- * response := input.Preprocess(ctx)
+ * handler := NewCompletionHandler(nil)
+ * response := input.Preprocess(ctx, handler)
  * if response != nil {
  *     // 预处理失败或被拒绝
  * }
  */
-func (in *CompletionInput) Preprocess(c *CompletionContext) *CompletionResponse {
+func (in *CompletionInput) Preprocess(c *CompletionContext, h *CompletionHandler) *CompletionResponse {
 	// 0. 补全拒绝规则链处理
-	err := NewFilterChain(config.Wrapper).Handle(in)
+	err := getFilterChain().Handle(in)
 	if err != nil {
 		return CancelRequest(in.CompletionID, in.Model, c.Perf, model.StatusRejected, err)
 	}
 	// 1. 解析请求参数
 	in.GetPrompts()
+	// 前缀、后缀不依赖上下文，在等待上下文检索期间提前编码
+	if h != nil {
+		h.prefetchPromptTokens(c.Ctx, &in.Processed)
+	}
 	// 2. 获取上下文信息
 	in.GetContext(c)
 	return nil
@@ -87,10 +125,7 @@ func (in *CompletionInput) GetContext(c *CompletionContext) {
 	if in.Processed.CodeContext != "" {
 		return
 	}
-	if contextClient == nil {
-		contextClient = codebase_context.NewContextClient()
-	}
-	in.Processed.CodeContext = contextClient.GetContext(
+	in.Processed.CodeContext = getContextClient().GetContext(
 		c.Ctx,
 		in.ClientID,
 		in.Processed.ProjectPath,
@@ -2,10 +2,48 @@ package completions
 
 import (
 	"code-completion/pkg/config"
+	"strings"
+	"sync"
 
 	"go.uber.org/zap"
 )
 
+/**
+ * 按配置解析好的处理器链模板
+ * @description
+ * - 配置在运行期间不变，处理器名称只需解析一次
+ * - 每次修剪时基于模板创建新链，命中记录互不干扰
+ */
+var (
+	prunerChainOnce     sync.Once
+	prunerChainTemplate *PrunerChain
+)
+
+/**
+ * 创建按配置组装的后置处理器链
+ * @returns {*PrunerChain} 返回共享处理器、独立命中记录的处理器链
+ * @description
+ * - 首次调用时根据配置解析处理器名称，之后复用解析结果
+ * - 如果配置了无效的处理器名称，记录错误并使用默认链
+ * - 未配置自定义处理器时使用默认链
+ */
+func newConfiguredPrunerChain() *PrunerChain {
+	prunerChainOnce.Do(func() {
+		if len(config.Wrapper.Prune.Pruners) > 0 {
+			chain, err := NewPrunerChainByNames(config.Wrapper.Prune.Pruners)
+			if err != nil {
+				zap.L().Error("Invalid config: 'wrapper.prune.pruners' contains invalid pruner names",
+					zap.Any("pruners", config.Wrapper.Prune.Pruners))
+			}
+			prunerChainTemplate = chain
+		}
+		if prunerChainTemplate == nil {
+			prunerChainTemplate = NewDefaultPrunerChain()
+		}
+	})
+	return NewPrunerChain(prunerChainTemplate.discarders, prunerChainTemplate.cutters)
+}
+
 /**
  * 修剪补全结果
  * @param {string} completionText - 原始补全文本内容
@@ -15,6 +53,7 @@ import (
  * @returns {string} 返回修剪后的补全文本
  * @description
  * - 使用后置处理器链修剪补全结果
+ * - 语言标识符在此统一转为小写，各修剪器无需重复转换
  * - 如果配置了自定义修剪器，使用自定义链
  * - 否则使用默认的后置处理器链
  * - 记录修剪过程的调试信息
@@ -30,23 +69,12 @@ import (
  */
 func (h *CompletionHandler) pruneCompletionCode(completionText, prefix, suffix, lang string) string {
 	prunerContext := &PrunerContext{
-		Language:       lang,
+		Language:       strings.ToLower(lang),
 		CompletionCode: completionText,
 		Prefix:         prefix,
 		Suffix:         suffix,
 	}
-	var chain *PrunerChain
-	var err error
-	if len(config.Wrapper.Prune.Pruners) > 0 {
-		chain, err = NewPrunerChainByNames(config.Wrapper.Prune.Pruners)
-		if err != nil {
-			zap.L().Error("Invalid config: 'wrapper.prune.pruners' contains invalid pruner names",
-				zap.Any("pruners", config.Wrapper.Prune.Pruners))
-		}
-	}
-	if chain == nil {
-		chain = NewDefaultPrunerChain()
-	}
+	chain := newConfiguredPrunerChain()
 	if chain.Process(prunerContext) {
 		zap.L().Info("Prune by Pruners",
 			zap.String("pre", completionText),
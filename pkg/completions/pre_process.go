@@ -2,15 +2,20 @@ package completions
 
 import (
 	"code-completion/pkg/config"
+	"context"
 	"strings"
+	"sync"
 )
 
 /**
  * 截断超长的提示词(前缀，后缀，上下文)
  * @param {*config.ModelConfig} cfg - 模型配置，包含最大前缀和后缀token限制
  * @param {*PromptOptions} ppt - 提示词选项，包含前缀、后缀和代码上下文
+ * @returns {int} 未发生截断时返回前缀+上下文的token数，供后续复用；发生截断或无法统计时返回0
  * @description
  * - 检查并截断超过模型限制的长提示词
+ * - 前缀、后缀、上下文的编码并行执行，上下文未变化时复用上次的编码
+ * - 前缀、后缀已在预处理期间提前编码时，直接使用预编码结果
  * - 优先保留最靠近补全位置的代码
  * - 如果前缀已超长，完全丢弃上下文
  * - 否则截断上下文以保留前缀
@@ -25,27 +30,54 @@ import (
  * handler.truncatePrompt(cfg, ppt)
  * // ppt中的内容会被截断到模型限制范围内
  */
-func (h *CompletionHandler) truncatePrompt(cfg *config.ModelConfig, ppt *PromptOptions) {
+func (h *CompletionHandler) truncatePrompt(cfg *config.ModelConfig, ppt *PromptOptions) int {
 	tokenizer := h.llm.Tokenizer()
 	if tokenizer == nil {
-		return
+		return 0
 	}
 
-	prefixTokens := tokenizer.Encode(ppt.Prefix)
-	prefixTokensNum := len(prefixTokens)
+	var prefixTokens, suffixTokens, contextTokens []int
+	prefetch := ppt.prefetch
+	ppt.prefetch = nil
+	if prefetch != nil && prefetch.prefix == ppt.Prefix && prefetch.suffix == ppt.Suffix {
+		// 前缀、后缀已在获取上下文期间编码，这里只需编码上下文
+		contextTokens = tokenizer.EncodeCached(ppt.CodeContext)
+		<-prefetch.done
+		prefixTokens, suffixTokens = prefetch.prefixTokens, prefetch.suffixTokens
+		if !prefetch.ok {
+			// 请求结束时预编码已放弃，补齐编码
+			suffixTokens = tokenizer.Encode(ppt.Suffix)
+			prefixTokens = tokenizer.Encode(ppt.Prefix)
+		}
+	} else {
+		// 前缀、后缀、上下文相互独立，并行编码
+		var wg sync.WaitGroup
+		wg.Add(2)
+		go func() {
+			defer wg.Done()
+			suffixTokens = tokenizer.Encode(ppt.Suffix)
+		}()
+		go func() {
+			defer wg.Done()
+			// 同一文件连续补全时检索到的上下文往往不变，复用上次的编码结果
+			contextTokens = tokenizer.EncodeCached(ppt.CodeContext)
+		}()
+		prefixTokens = tokenizer.Encode(ppt.Prefix)
+		wg.Wait()
+	}
 
-	suffixTokens := tokenizer.Encode(ppt.Suffix)
+	prefixTokensNum := len(prefixTokens)
 	suffixTokensNum := len(suffixTokens)
-
-	contextTokens := tokenizer.Encode(ppt.CodeContext)
 	contextTokensNum := len(contextTokens)
 
-	// 获取最大模型长度限制
-	prefixMax := h.llm.Config().MaxPrefix
-	suffixMax := h.llm.Config().MaxSuffix
+	// 获取最大模型长度限制，直接使用调用方传入的模型配置
+	prefixMax := cfg.MaxPrefix
+	suffixMax := cfg.MaxSuffix
 
+	promptTokensNum := prefixTokensNum + contextTokensNum
 	// 如果总token数超过限制，需要截断
 	if prefixTokensNum+contextTokensNum > prefixMax {
+		promptTokensNum = 0 // 截断后的文本需重新编码才能得到准确数量
 		needCutTokens := prefixTokensNum + contextTokensNum - prefixMax
 
 		// 前缀都已经超长了，就把上下文完全丢弃掉
@@ -64,6 +96,49 @@ func (h *CompletionHandler) truncatePrompt(cfg *config.ModelConfig, ppt *PromptO
 		ppt.Suffix = tokenizer.Decode(suffixTokens)
 		ppt.Suffix = h.trimLastLine(ppt.Suffix)
 	}
+	return promptTokensNum
+}
+
+// promptPrefetch 在获取上下文期间提前编码的前缀和后缀
+type promptPrefetch struct {
+	prefix, suffix             string
+	prefixTokens, suffixTokens []int
+	ok                         bool          // 前缀和后缀都已编码
+	done                       chan struct{} // 编码结束或放弃后关闭
+}
+
+/**
+ * 提前编码前缀和后缀
+ * @param {context.Context} ctx - 请求上下文，请求结束后不再开始新的编码
+ * @param {*PromptOptions} ppt - 提示词选项，此时尚未获取上下文
+ * @description
+ * - 前缀和后缀不依赖上下文，可与上下文检索的网络请求重叠执行
+ * - 在一个后台协程中依次编码后缀和前缀，结果记录在ppt上，由truncatePrompt取用
+ * - 每段编码开始前检查请求上下文，请求被取消、超时或因被新请求取代而返回后放弃剩余编码
+ * - truncatePrompt发现前缀或后缀已变化时会放弃预编码结果，重新编码
+ * - 没有tokenizer或请求已结束时不做任何事
+ */
+func (h *CompletionHandler) prefetchPromptTokens(ctx context.Context, ppt *PromptOptions) {
+	tokenizer := h.llm.Tokenizer()
+	if tokenizer == nil || ctx.Err() != nil {
+		return
+	}
+	p := &promptPrefetch{
+		prefix: ppt.Prefix,
+		suffix: ppt.Suffix,
+		done:   make(chan struct{}),
+	}
+	ppt.prefetch = p
+	go func() {
+		defer close(p.done)
+		p.suffixTokens = tokenizer.Encode(p.suffix)
+		// 前缀通常是最长的一段，请求已结束时不再编码
+		if ctx.Err() != nil {
+			return
+		}
+		p.prefixTokens = tokenizer.Encode(p.prefix)
+		p.ok = true
+	}()
 }
 
 /**
@@ -142,7 +217,7 @@ func (h *CompletionHandler) getTokensCount(prompt string) int {
  * @param {*CompletionInput} input - 补全输入对象，包含请求参数和停用词设置
  * @returns {[]string} 返回停用词列表
  * @description
- * - 合并请求中的停用词和系统默认停用词
+ * - 合并请求中的停用词和系统默认停用词，结果切片只分配一次
  * - 添加默认的FIM停用词"<｜end▁of▁sentence｜>"
  * - 如果后缀为空或只包含空白字符，添加多行停用词
  * - 用于控制补全生成的停止条件
@@ -155,12 +230,11 @@ func (h *CompletionHandler) getTokensCount(prompt string) int {
  * // stopWords = [";", "}", "<｜end▁of▁sentence｜>", "\n\n", "\n\n\n"]
  */
 func (h *CompletionHandler) prepareStopWords(input *CompletionInput) []string {
-	var stopWords []string
+	// 按最大可能数量一次性分配：请求停用词 + FIM停用词 + 2个多行停用词
+	stopWords := make([]string, 0, len(input.Stop)+3)
 
 	// 添加请求中的停用词
-	if len(input.Stop) > 0 {
-		stopWords = append(stopWords, input.Stop...)
-	}
+	stopWords = append(stopWords, input.Stop...)
 
 	// 添加默认的FIM停用词
 	stopWords = append(stopWords, "<｜end▁of▁sentence｜>")
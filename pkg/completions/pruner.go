@@ -81,11 +81,20 @@ var prunerDefs map[string]Pruner = map[string]Pruner{
  * }
  */
 type PrunerContext struct {
-	CompletionID   string `json:"completion_id"`
-	Language       string `json:"language"`
-	CompletionCode string `json:"completion_code"`
-	Prefix         string `json:"prefix"`
-	Suffix         string `json:"suffix"`
+	CompletionID   string        `json:"completion_id"`
+	Language       string        `json:"language"` // 小写的语言标识符
+	CompletionCode string        `json:"completion_code"`
+	Prefix         string        `json:"prefix"`
+	Suffix         string        `json:"suffix"`
+	parser         parser.Parser // 首次使用时按语言获取，链上各处理器共用
+}
+
+// syntaxParser 获取该语言的语法分析器，同一上下文只查找一次
+func (ctx *PrunerContext) syntaxParser() parser.Parser {
+	if ctx.parser == nil {
+		ctx.parser = parser.GetSimpleParser(ctx.Language)
+	}
+	return ctx.parser
 }
 
 /**
@@ -444,7 +453,7 @@ type NotMatchLanguageDiscarder struct{ Discarder }
 
 func (p *NotMatchLanguageDiscarder) Process(ctx *PrunerContext) bool {
 	// 非python语言但是python代码，则丢弃补全内容
-	if strings.ToLower(ctx.Language) != "python" && IsPythonText(ctx.CompletionCode) {
+	if ctx.Language != "python" && IsPythonText(ctx.CompletionCode) {
 		ctx.CompletionCode = ""
 		return true
 	}
@@ -603,7 +612,7 @@ type CssContentDiscarder struct{ Discarder }
 
 func (p *CssContentDiscarder) Process(ctx *PrunerContext) bool {
 	// 如果是非CSS语言但是包含CSS内容，则去除CSS内容
-	if strings.ToLower(ctx.Language) != "css" && JudgeCss(ctx.Language, ctx.CompletionCode, 0.7) {
+	if ctx.Language != "css" && JudgeCss(ctx.Language, ctx.CompletionCode, 0.7) {
 		ctx.CompletionCode = ""
 		return true
 	}
@@ -636,7 +645,7 @@ func (p *CssContentDiscarder) Name() string {
 type SyntaxErrorDiscarder struct{ Discarder }
 
 func (p *SyntaxErrorDiscarder) Process(ctx *PrunerContext) bool {
-	if !isCodeSyntax(ctx.Language, ctx.CompletionCode, ctx.Prefix, ctx.Suffix) {
+	if !isCodeSyntax(ctx.syntaxParser(), ctx.CompletionCode, ctx.Prefix, ctx.Suffix) {
 		ctx.CompletionCode = ""
 		return true
 	}
@@ -670,7 +679,7 @@ type SyntaxErrorCutter struct{ Cutter }
 
 func (p *SyntaxErrorCutter) Process(ctx *PrunerContext) bool {
 	// 进行语法错误拦截和代码裁剪
-	tsUtil := parser.NewSimpleParser(ctx.Language)
+	tsUtil := ctx.syntaxParser()
 	if tsUtil == nil {
 		return false
 	}
@@ -704,26 +713,25 @@ func (p *SingleLineCutter) Name() string {
 
 /**
  * 检查代码语法是否正确
- * @param {string} language - 编程语言标识符
+ * @param {parser.Parser} tsUtil - 对应语言的语法分析器
  * @param {string} code - 要检查的代码内容
  * @param {string} prefix - 代码前缀，用于上下文
  * @param {string} suffix - 代码后缀，用于上下文
  * @returns {bool} 返回语法是否正确
  * @description
- * - 创建指定语言的简单语法分析器
+ * - 使用调用方提供的语法分析器，通常来自PrunerContext
  * - 提取准确的代码块前后缀
  * - 将前缀、代码和后缀组合进行语法检查
  * - 如果分析器创建失败，默认返回true
  * - 用于语法错误处理器的语法验证
  * @example
- * valid := isCodeSyntax("python", "    return", "def ", "\nprint('hello')")
+ * valid := isCodeSyntax(parser.GetSimpleParser("python"), "    return", "def ", "\nprint('hello')")
  * // valid = true
  *
- * invalid := isCodeSyntax("python", "def test(\n    return", "def ", "\nprint('hello')")
+ * invalid := isCodeSyntax(parser.GetSimpleParser("python"), "def test(\n    return", "def ", "\nprint('hello')")
  * // invalid = false (语法错误)
  */
-func isCodeSyntax(language, code, prefix, suffix string) bool {
-	tsUtil := parser.NewSimpleParser(language)
+func isCodeSyntax(tsUtil parser.Parser, code, prefix, suffix string) bool {
 	if tsUtil == nil {
 		return true
 	}
@@ -753,7 +761,7 @@ func needSingleLine(linePrefix, lineSuffix, language string) bool {
 	}
 
 	// 根据语言类型判断
-	switch strings.ToLower(language) {
+	switch language {
 	case "python", "javascript", "typescript", "java", "c", "cpp":
 		// 对于这些语言，如果光标在行首，可能是单行补全
 		if strings.TrimSpace(linePrefix) == "" {
@@ -765,27 +773,25 @@ func needSingleLine(linePrefix, lineSuffix, language string) bool {
 }
 
 func pruneSingleLine(completionText, prefix, suffix, lang string) string {
-	var linePrefix, lineSuffix string
-	lines := strings.Split(prefix, "\n")
-	if len(lines) > 0 {
-		linePrefix = lines[len(lines)-1]
-	}
-	lines = strings.Split(suffix, "\n")
-	if len(lines) > 0 {
-		lineSuffix = lines[0]
-		if len(lines) > 1 {
-			lineSuffix += "\n"
-		}
+	// 只需光标所在行和补全的首行，按换行符定位后直接切片，不切分整段文本
+	linePrefix := prefix[strings.LastIndexByte(prefix, '\n')+1:]
+	lineSuffix := suffix
+	if i := strings.IndexByte(lineSuffix, '\n'); i >= 0 {
+		lineSuffix = lineSuffix[:i+1]
 	}
 	if needSingleLine(linePrefix, lineSuffix, lang) {
-		lines := strings.Split(completionText, "\n")
-		if len(lines) <= 1 {
+		i := strings.IndexByte(completionText, '\n')
+		if i < 0 {
 			return completionText
 		}
-		if lines[0] == "" {
-			return "\n" + lines[1]
+		if i == 0 {
+			// 以换行开头时保留该换行和下一行
+			if j := strings.IndexByte(completionText[1:], '\n'); j >= 0 {
+				return completionText[:j+1]
+			}
+			return completionText
 		}
-		return lines[0]
+		return completionText[:i]
 	}
 	return completionText
 }
@@ -0,0 +1,56 @@
+package completions
+
+import (
+	"strings"
+	"testing"
+)
+
+// pruneSingleLineReference 切分整段文本读取光标行的原实现，作为pruneSingleLine的对照
+func pruneSingleLineReference(completionText, prefix, suffix, lang string) string {
+	var linePrefix, lineSuffix string
+	lines := strings.Split(prefix, "\n")
+	if len(lines) > 0 {
+		linePrefix = lines[len(lines)-1]
+	}
+	lines = strings.Split(suffix, "\n")
+	if len(lines) > 0 {
+		lineSuffix = lines[0]
+		if len(lines) > 1 {
+			lineSuffix += "\n"
+		}
+	}
+	if needSingleLine(linePrefix, lineSuffix, lang) {
+		lines := strings.Split(completionText, "\n")
+		if len(lines) <= 1 {
+			return completionText
+		}
+		if lines[0] == "" {
+			return "\n" + lines[1]
+		}
+		return lines[0]
+	}
+	return completionText
+}
+
+func FuzzPruneSingleLine(f *testing.F) {
+	seeds := []struct{ completion, prefix, suffix string }{
+		{"x = 1\ny = 2", "def f():\n    ", ""},
+		{"\nreturn x\nfoo", "obj.", "\n}"},
+		{"value", "", "rest\nmore"},
+		{"\n", "\t", "\n"},
+		{"\n\nz", "a = ", "b"},
+		{"", "x\n", ""},
+	}
+	for i, s := range seeds {
+		f.Add(s.completion, s.prefix, s.suffix, uint8(i))
+	}
+	languages := []string{"python", "go", "javascript", ""}
+	f.Fuzz(func(t *testing.T, completion, prefix, suffix string, langIdx uint8) {
+		lang := languages[int(langIdx)%len(languages)]
+		got := pruneSingleLine(completion, prefix, suffix, lang)
+		want := pruneSingleLineReference(completion, prefix, suffix, lang)
+		if got != want {
+			t.Errorf("pruneSingleLine(%q, %q, %q, %q) = %q, want %q", completion, prefix, suffix, lang, got, want)
+		}
+	})
+}
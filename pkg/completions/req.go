@@ -29,6 +29,8 @@ type PromptOptions struct {
 	ProjectPath     string `json:"project_path,omitempty"`
 	FileProjectPath string `json:"file_project_path,omitempty"`
 	ImportContent   string `json:"import_content,omitempty"`
+
+	prefetch *promptPrefetch // 预处理期间提前编码的前缀和后缀，不参与序列化
 }
 
 // 计算隐藏分数配置
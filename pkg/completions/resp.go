@@ -73,6 +73,10 @@ type CompletionResponse struct {
 	Verbose *model.CompletionVerbose `json:"verbose,omitempty"`
 }
 
+// emptyChoices 失败、取消响应共用的空补全结果，响应生成后只被序列化，不会修改
+// 用户连续输入时大量请求被取消，共用可避免每个响应都分配一次
+var emptyChoices = []CompletionChoice{{Text: ""}}
+
 /**
  * 记录补全性能指标
  * @param {string} modelName - 模型名称，用于指标分类
@@ -82,15 +86,13 @@ type CompletionResponse struct {
  * - 记录补全请求的各阶段耗时指标
  * - 记录补全请求计数指标
  * - 记录输入和输出token使用指标
- * - 使用metrics包进行指标上报
+ * - 通过metrics.RecordCompletion批量上报，一次调用完成全部指标记录
  * - 用于监控补全服务的性能和资源使用情况
  */
 func Metrics(modelName string, status string, perf *CompletionPerformance) {
-	metrics.RecordCompletionDuration(modelName, status,
-		perf.QueueDuration, perf.ContextDuration, perf.LLMDuration, perf.TotalDuration)
-	metrics.IncrementCompletionRequests(modelName, status)
-	metrics.RecordCompletionTokens(modelName, metrics.TokenTypeInput, perf.PromptTokens)
-	metrics.RecordCompletionTokens(modelName, metrics.TokenTypeOutput, perf.CompletionTokens)
+	metrics.RecordCompletion(modelName, status,
+		perf.QueueDuration, perf.ContextDuration, perf.LLMDuration, perf.TotalDuration,
+		perf.PromptTokens, perf.CompletionTokens)
 }
 
 /**
@@ -120,7 +122,7 @@ func ErrorResponse(completionId, modelName string, status model.CompletionStatus
 		ID:      completionId,
 		Model:   modelName,
 		Object:  "text_completion",
-		Choices: []CompletionChoice{{Text: ""}}, // 使用后置处理后的补全结果
+		Choices: emptyChoices,
 		Created: int(perf.ReceiveTime.Unix()),
 		Usage:   *perf,
 		Status:  status,
@@ -184,7 +186,7 @@ func CancelRequest(completionId, modelName string, perf *CompletionPerformance,
 		ID:      completionId,
 		Model:   modelName,
 		Object:  "text_completion",
-		Choices: []CompletionChoice{{Text: ""}},
+		Choices: emptyChoices,
 		Created: int(perf.ReceiveTime.Unix()),
 		Usage:   *perf,
 		Status:  status,
@@ -1,10 +1,14 @@
 package completions
 
 import (
+	"code-completion/pkg/parser"
+	"maps"
 	"os"
 	"regexp"
 	"strings"
+	"sync"
 	"unicode"
+	"unicode/utf8"
 )
 
 // STR_PREFIX_CONFIG 字符串前缀配置
@@ -18,24 +22,51 @@ var STR_PREFIX_CONFIG = []struct {
 	{30, 60},
 }
 
+// prefixMatchPool KMP前缀函数结果的缓冲区池，结果只在调用方内部使用，用完即归还
+var prefixMatchPool = sync.Pool{
+	New: func() any {
+		return new([]int)
+	},
+}
+
+// maxPooledPrefixMatchLen 超过该长度的缓冲区不放回池中，避免个别超长补全长期占用内存
+const maxPooledPrefixMatchLen = 1 << 16
+
 /**
  * Compute the longest prefix suffix match length for a string
  * @param {string} content - Input string to compute prefix suffix matches
  * @returns {[]int} Returns array of match lengths for each position
+ * @returns {*[]int} Returns the pooled buffer backing the array, to be released with putPrefixMatchBuffer
  * @description
  * - Implements KMP algorithm's prefix function to compute longest prefix suffix matches
  * - Returns empty array for empty input
  * - Each position i stores the length of longest proper prefix which is also suffix
+ * - The array lives in a pooled buffer; callers must not keep it after releasing the buffer
  * @example
- * matches := computePrefixSuffixMatchLength("ababc")
+ * matches, bufp := computePrefixSuffixMatchLength("ababc")
+ * defer putPrefixMatchBuffer(bufp)
  * // matches will be [-1, 0, 0, 1, 2]
  */
-func computePrefixSuffixMatchLength(content string) []int {
+func computePrefixSuffixMatchLength(content string) ([]int, *[]int) {
+	bufp := prefixMatchPool.Get().(*[]int)
+	if cap(*bufp) < len(content) {
+		*bufp = make([]int, len(content))
+	}
 	if len(content) == 0 {
-		return []int{}
+		return (*bufp)[:0], bufp
+	}
+	return fillPrefixSuffixMatchLength(content, (*bufp)[:len(content)]), bufp
+}
+
+// putPrefixMatchBuffer 归还computePrefixSuffixMatchLength取出的缓冲区
+func putPrefixMatchBuffer(bufp *[]int) {
+	if cap(*bufp) <= maxPooledPrefixMatchLen {
+		prefixMatchPool.Put(bufp)
 	}
+}
 
-	matchLengths := make([]int, len(content))
+// fillPrefixSuffixMatchLength 将content的KMP前缀函数写入matchLengths，len(matchLengths)须等于len(content)且大于0
+func fillPrefixSuffixMatchLength(content string, matchLengths []int) []int {
 	matchLengths[0] = -1
 	matchIndex := -1
 
@@ -66,7 +97,8 @@ func computePrefixSuffixMatchLength(content string) []int {
  * }
  */
 func isRepetitiveContent(content string) bool {
-	matchLengths := computePrefixSuffixMatchLength(content)
+	matchLengths, bufp := computePrefixSuffixMatchLength(content)
+	defer putPrefixMatchBuffer(bufp)
 
 	for _, config := range STR_PREFIX_CONFIG {
 		// 考虑最后lastTokensToConsider个字符组成的字符串的前后缀重复字符数
@@ -167,6 +199,7 @@ func filterNonEmptyLines(content string) string {
  * @returns {bool} Returns true if string has no alphabetic characters, false otherwise
  * @description
  * - Iterates through each character in the string
+ * - Classifies ASCII bytes with a lookup table, decoding runes only for non-ASCII input
  * - Returns false if any alphabetic character is found
  * - Returns true if all characters are non-alphabetic
  * @example
@@ -175,14 +208,32 @@ func filterNonEmptyLines(content string) string {
  * }
  */
 func containsOnlyNonAlpha(input string) bool {
-	for _, c := range input {
+	for i := 0; i < len(input); {
+		if b := input[i]; b < utf8.RuneSelf {
+			if asciiLetters[b] {
+				return false
+			}
+			i++
+			continue
+		}
+		c, size := utf8.DecodeRuneInString(input[i:])
 		if unicode.IsLetter(c) {
 			return false
 		}
+		i += size
 	}
 	return true
 }
 
+// asciiLetters ASCII字符是否为字母的查找表
+var asciiLetters = func() (table [utf8.RuneSelf]bool) {
+	for c := 'a'; c <= 'z'; c++ {
+		table[c] = true
+		table[c-'a'+'A'] = true
+	}
+	return table
+}()
+
 /**
  * Check if text appears at the end of prefix or start of suffix
  * @param {string} text - Text to check for inclusion
@@ -205,13 +256,12 @@ func checkContextIncludeText(text, prefix, suffix string) bool {
 		return true
 	}
 
-	if len(text) <= 3 && strings.TrimSpace(suffix) != "" &&
-		strings.HasPrefix(strings.TrimSpace(suffix), string(text[0])) {
+	trimmedSuffix := strings.TrimSpace(suffix)
+	if len(text) <= 3 && strings.HasPrefix(trimmedSuffix, string(text[0])) {
 		return true
 	}
 
-	if containsOnlyNonAlpha(text) && strings.TrimSpace(suffix) != "" &&
-		strings.HasPrefix(strings.TrimSpace(suffix), string(text[0])) {
+	if strings.HasPrefix(trimmedSuffix, string(text[0])) && containsOnlyNonAlpha(text) {
 		return true
 	}
 
@@ -222,13 +272,21 @@ func checkContextIncludeText(text, prefix, suffix string) bool {
 	trimmedText := strings.TrimSpace(text)
 	trimmedPrefix := strings.TrimSpace(prefix)
 
-	lineCount := len(strings.Split(text, "\n"))
-	suffixLines := strings.Split(strings.TrimSpace(suffix), "\n")
-	doubleTextLines := suffixLines
-	if len(suffixLines) > lineCount*2 {
-		doubleTextLines = suffixLines[:lineCount*2]
+	// 行数只需计数；suffix只取前lineCount*2行，不切分整个后缀
+	lineCount := strings.Count(text, "\n") + 1
+	doubleText := trimmedSuffix
+	end := 0
+	for i := 0; i < lineCount*2; i++ {
+		idx := strings.IndexByte(doubleText[end:], '\n')
+		if idx < 0 {
+			end = -1
+			break
+		}
+		end += idx + 1
+	}
+	if end > 0 {
+		doubleText = doubleText[:end-1]
 	}
-	doubleText := strings.Join(doubleTextLines, "\n")
 
 	if strings.HasSuffix(trimmedPrefix, trimmedText) {
 		return true
@@ -270,15 +328,18 @@ func cutSuffixOverlap(text, prefix, suffix string, cutLine int, ignoreOverlapLen
 	suffix = strings.TrimSpace(suffix)
 
 	// 循环多次，每次都截掉suffix的首行再进行内容重叠切割
+	// 在同一个suffix字符串上前移，不再反复切分和拼接
 	for i := 0; i < cutLine; i++ {
-		suffixLines := strings.Split(suffix, "\n")
 		suffixLen := len(suffix)
 
 		if textLen == 0 || suffixLen == 0 {
 			return text
 		}
 
-		firstLineSuffixLen := len(suffixLines[0])
+		firstLineSuffixLen := strings.IndexByte(suffix, '\n')
+		if firstLineSuffixLen < 0 {
+			firstLineSuffixLen = suffixLen
+		}
 		maxOverlapLength := min(textLen, suffixLen)
 
 		for j := maxOverlapLength; j > maxOverlapLength/2; j-- {
@@ -288,7 +349,7 @@ func cutSuffixOverlap(text, prefix, suffix string, cutLine int, ignoreOverlapLen
 			}
 
 			// 若suffix首行长度等于判重长度且首行仅有一个单词，那么无需判重直接返回
-			if j == firstLineSuffixLen && len(strings.Split(suffix[:j], " ")) == 1 {
+			if j == firstLineSuffixLen && !strings.Contains(suffix[:j], " ") {
 				break
 			}
 
@@ -301,8 +362,8 @@ func cutSuffixOverlap(text, prefix, suffix string, cutLine int, ignoreOverlapLen
 			}
 		}
 
-		if len(suffixLines) > 1 {
-			suffix = strings.Join(suffixLines[1:], "\n")
+		if firstLineSuffixLen < suffixLen {
+			suffix = suffix[firstLineSuffixLen+1:]
 		} else {
 			suffix = ""
 		}
@@ -348,8 +409,10 @@ func cutPrefixOverlap(text, prefix, suffix string, cutLine int) string {
 	}
 
 	// Clean and split prefix into lines
+	// The sliding windows below only reach the last len(splitText)+cutLine-1 lines of prefix,
+	// so only that tail is split instead of the whole file
 	prefix = strings.TrimSpace(prefix)
-	splitPrefix := strings.Split(prefix, "\n")
+	splitPrefix := strings.Split(parser.LastLines(prefix, len(splitText)+max(cutLine, 1)-1), "\n")
 
 	// Determine the maximum number of lines to compare
 	matchLine := min(len(splitPrefix), len(splitText))
@@ -392,7 +455,8 @@ func cutPrefixOverlap(text, prefix, suffix string, cutLine int) string {
 					return ""
 				}
 				// If 60% or more lines match, also consider it significant overlap
-				if float64(matchCount)/float64(matchLine) >= 0.6 {
+				// (matchCount/matchLine >= 3/5, compared in integers)
+				if matchCount*5 >= matchLine*3 {
 					return ""
 				}
 			} else {
@@ -417,6 +481,7 @@ func cutPrefixOverlap(text, prefix, suffix string, cutLine int) string {
  * - Filters out empty lines from both texts
  * - Returns false if completion has more lines than prefix
  * - Compares completion lines with corresponding prefix ending lines
+ * - Walks the prefix backwards only as far as needed instead of splitting all of it
  * @example
  * if judgePrefixFullLineRepetitive("text", "prefix text") {
  *     // Completion completely repeats prefix ending
@@ -427,10 +492,9 @@ func judgePrefixFullLineRepetitive(completionText, prefix string) bool {
 		return false
 	}
 
-	splitPrefixText := strings.Split(prefix, "\n")
 	// 若将同行光标前的内容拼接到补全内容中，便于完全匹配
-	linePrefixText := splitPrefixText[len(splitPrefixText)-1]
-	completionText = linePrefixText + completionText
+	lastNewline := strings.LastIndexByte(prefix, '\n')
+	completionText = prefix[lastNewline+1:] + completionText
 
 	splitCompletionText := strings.Split(completionText, "\n")
 	var nonEmptyCompletionText []string
@@ -439,31 +503,30 @@ func judgePrefixFullLineRepetitive(completionText, prefix string) bool {
 			nonEmptyCompletionText = append(nonEmptyCompletionText, line)
 		}
 	}
-
-	splitPrefixText = splitPrefixText[:len(splitPrefixText)-1]
-	var nonEmptyPrefixText []string
-	for _, line := range splitPrefixText {
-		if strings.TrimSpace(line) != "" {
-			nonEmptyPrefixText = append(nonEmptyPrefixText, line)
-		}
+	if len(nonEmptyCompletionText) == 0 {
+		return true
 	}
-
-	// 若补全内容行数大于匹配内容行数，则直接返回False
-	if len(nonEmptyCompletionText) > len(nonEmptyPrefixText) {
+	// 光标所在行之前没有其它行
+	if lastNewline < 0 {
 		return false
 	}
 
-	if len(nonEmptyPrefixText) >= len(nonEmptyCompletionText) {
-		nonEmptyPrefixText = nonEmptyPrefixText[len(nonEmptyPrefixText)-len(nonEmptyCompletionText):]
-	}
-
-	for i := 0; i < len(nonEmptyCompletionText); i++ {
-		if nonEmptyCompletionText[i] != nonEmptyPrefixText[i] {
-			return false
+	// 只需比较前缀末尾的若干非空行，从光标行往前逐行查找，不切分整个前缀
+	n := len(nonEmptyCompletionText)
+	end := lastNewline
+	for end >= 0 && n > 0 {
+		start := strings.LastIndexByte(prefix[:end], '\n')
+		line := prefix[start+1 : end]
+		if strings.TrimSpace(line) != "" {
+			n--
+			if line != nonEmptyCompletionText[n] {
+				return false
+			}
 		}
+		end = start
 	}
-
-	return true
+	// 前缀的非空行数少于补全内容的非空行数
+	return n == 0
 }
 
 /**
@@ -485,7 +548,7 @@ func cutRepetitiveText(text string) string {
 	}
 
 	// 行数超过3才触发去重
-	lineCount := len(strings.Split(strings.TrimSpace(text), "\n"))
+	lineCount := strings.Count(strings.TrimSpace(text), "\n") + 1
 	if lineCount < 3 {
 		return text
 	}
@@ -527,13 +590,14 @@ func doCutRepetitiveText(text string, ratio float64) string {
 	reversedText := reverseString(strings.TrimRight(text, " \t\n\r"))
 
 	// 计算当前逆转后的补全文本的最长前后缀长度
-	matchLengths := computePrefixSuffixMatchLength(reversedText)
+	matchLengths, bufp := computePrefixSuffixMatchLength(reversedText)
 	maxMatchLengths := 0
 	for _, length := range matchLengths {
 		if length > maxMatchLengths {
 			maxMatchLengths = length
 		}
 	}
+	putPrefixMatchBuffer(bufp)
 
 	// 若最长前后缀长度/补全内容长度大于等于ratio则判断为重复内容
 	if maxMatchLengths > 0 && float64(maxMatchLengths)/float64(len(reversedText)) >= ratio {
@@ -555,6 +619,13 @@ func doCutRepetitiveText(text string, ratio float64) string {
 	return result
 }
 
+// lcsRowPool 最长公共子串DP行缓冲区池，isExtremeRepetition逐行调用时反复复用
+var lcsRowPool = sync.Pool{
+	New: func() any {
+		return new([]int)
+	},
+}
+
 /**
  * Calculate the longest common substring between two strings
  * @param {string} a - First string for comparison
@@ -562,7 +633,8 @@ func doCutRepetitiveText(text string, ratio float64) string {
  * @returns {string} Returns longest common substring, empty string if no common substring
  * @description
  * - Returns empty string if either input is empty
- * - Uses dynamic programming approach with O(m*n) complexity
+ * - Uses dynamic programming approach with O(m*n) complexity and two reused rows
+ * - Takes the row buffer from a pool shared across calls instead of allocating it each time
  * - Tracks maximum length and ending position of common substring
  * - Extracts and returns the longest common substring
  * @example
@@ -575,22 +647,32 @@ func longestCommonSubstring(a, b string) string {
 		return ""
 	}
 
-	prev := make([]int, n+1)
+	// 只保留两行DP状态，交替复用，避免每行重新分配；两行共用的缓冲区从池中取用
+	bufp := lcsRowPool.Get().(*[]int)
+	defer lcsRowPool.Put(bufp)
+	if cap(*bufp) < 2*(n+1) {
+		*bufp = make([]int, 2*(n+1))
+	}
+	buf := (*bufp)[:2*(n+1)]
+	clear(buf)
+	prev, current := buf[:n+1], buf[n+1:]
 	maxLen := 0
 	end := 0
 
 	for i := 1; i <= m; i++ {
-		current := make([]int, n+1)
+		ai := a[i-1]
 		for j := 1; j <= n; j++ {
-			if a[i-1] == b[j-1] {
+			if ai == b[j-1] {
 				current[j] = prev[j-1] + 1
 				if current[j] > maxLen {
 					maxLen = current[j]
 					end = i
 				}
+			} else {
+				current[j] = 0
 			}
 		}
-		prev = current
+		prev, current = current, prev
 	}
 
 	if maxLen == 0 {
@@ -612,6 +694,7 @@ func longestCommonSubstring(a, b string) string {
  * - Checks if LCS length is significant (> 5 chars and >= half line length)
  * - Counts occurrences with same position in subsequent lines
  * - Returns true if repetition count > 8 or > half of total lines
+ * - Stops early once too few lines remain to reach that count
  * @example
  * hasRepetition, pattern, count := isExtremeRepetition("line1\nline1\nline1")
  * if hasRepetition {
@@ -639,7 +722,10 @@ func isExtremeRepetition(code string) (bool, string, int) {
 
 	n := len(nonEmptyLines)
 
-	for i := 0; i < n-1; i++ {
+	// 第i行的重复次数最多为其后的行数n-1-i，一旦不可能超过判定阈值，
+	// 后续行都无需再计算开销较大的最长公共子串，直接结束
+	threshold := min(8, n/2)
+	for i := 0; n-1-i > threshold; i++ {
 		lcs := longestCommonSubstring(nonEmptyLines[i], nonEmptyLines[i+1])
 
 		// 如果最长公共子串长度大于5且不小于行数的一半，则进行匹配过程
@@ -650,13 +736,17 @@ func isExtremeRepetition(code string) (bool, string, int) {
 				continue
 			}
 
-			// 统计重复次数
+			// 统计重复次数：lcs首次出现位置与第一行相同才计数，
+			// 只需在[0, firstLineLcsIndex+len(lcs))范围内查找一次
 			count := 0
+			end := firstLineLcsIndex + len(lcs)
 			for k := i + 1; k < n; k++ {
-				if strings.Contains(nonEmptyLines[k], lcs) {
-					if strings.Index(nonEmptyLines[k], lcs) == firstLineLcsIndex {
-						count++
-					}
+				line := nonEmptyLines[k]
+				if len(line) < end {
+					continue
+				}
+				if strings.Index(line[:end], lcs) == firstLineLcsIndex {
+					count++
 				}
 			}
 
@@ -689,14 +779,18 @@ func min(a, b int) int {
 	return b
 }
 
+// pythonTextRules Python文本特征规则，启动时从环境变量PYTHON_TEXT_RULES读取一次
+var pythonTextRules = func() []string {
+	rules := os.Getenv("PYTHON_TEXT_RULES")
+	if rules == "" {
+		rules = "return self.name"
+	}
+	return strings.Split(rules, ",")
+}()
+
 // IsPythonText 判断是否为Python文本
 func IsPythonText(text string) bool {
-	pythonTextRules := os.Getenv("PYTHON_TEXT_RULES")
-	if pythonTextRules == "" {
-		pythonTextRules = "return self.name"
-	}
-	rules := strings.Split(pythonTextRules, ",")
-	for _, rule := range rules {
+	for _, rule := range pythonTextRules {
 		if strings.Contains(text, rule) {
 			return true
 		}
@@ -706,8 +800,8 @@ func IsPythonText(text string) bool {
 
 // CSS相关正则表达式
 var (
-	cssPropertyPattern          = regexp.MustCompile(`^\s*[a-zA-Z-]+\s*:\s*[^;]+;\s*$`)
-	cssSelectorPattern          = regexp.MustCompile(`^\s*[.#]?[a-zA-Z0-9_-]+\s*\{`)
+	// cssLinePattern 将CSS属性与CSS选择器两种规则合并为一个分支表达式，单次匹配即可完成判断
+	cssLinePattern              = regexp.MustCompile(`^\s*(?:[a-zA-Z-]+\s*:\s*[^;]+;\s*$|[.#]?[a-zA-Z0-9_-]+\s*\{)`)
 	cssCommentPattern           = regexp.MustCompile(`/\*.*?\*/`)
 	multilineCssPropertyPattern = regexp.MustCompile(`^\s*[a-zA-Z-]+\s*:\s*[^;]+;\s*$`)
 )
@@ -727,28 +821,28 @@ func (e FrontLanguageEnum) GetValues() []FrontLanguageEnum {
 	return []FrontLanguageEnum{FrontLanguageVue, FrontLanguageHTML, FrontLanguageTS, FrontLanguageCSS}
 }
 
+// frontLanguageSet 前端语言集合，由GetValues预先生成，用于O(1)判断
+var frontLanguageSet = func() map[string]struct{} {
+	set := make(map[string]struct{})
+	for _, lang := range FrontLanguageEnum("").GetValues() {
+		set[string(lang)] = struct{}{}
+	}
+	return set
+}()
+
 // JudgeCss 判断文本是否为css样式
 func JudgeCss(language string, text string, ratio float64) bool {
 	// 检查语言是否为前端语言
-	isFrontLanguage := false
-	frontLanguages := FrontLanguageEnum("").GetValues()
-	for _, lang := range frontLanguages {
-		if strings.ToLower(language) == string(lang) {
-			isFrontLanguage = true
-			break
-		}
-	}
-
-	if !isFrontLanguage {
+	if _, ok := frontLanguageSet[strings.ToLower(language)]; !ok {
 		return false
 	}
 
-	if strings.Count(text, "\n") == 0 {
+	if !strings.Contains(text, "\n") {
 		return false
 	}
 
 	// 判断是否为多行CSS属性
-	if multilineCssPropertyPattern.MatchString(text) {
+	if isSingleCssDeclaration(text) && multilineCssPropertyPattern.MatchString(text) {
 		return true
 	}
 
@@ -771,72 +865,93 @@ func JudgeCss(language string, text string, ratio float64) bool {
 	return false
 }
 
+// isSingleCssDeclaration 多行CSS属性正则的必要条件：文本只含一个';'且以它结尾（忽略尾部空白），
+// 不满足时可直接跳过正则匹配
+func isSingleCssDeclaration(text string) bool {
+	idx := strings.IndexByte(text, ';')
+	return idx >= 0 && idx == len(strings.TrimRight(text, " \t\n\f\r"))-1
+}
+
 // IncludeCss 包含css样式
 func IncludeCss(line string) bool {
-	// 去除CSS注释
-	line = cssCommentPattern.ReplaceAllString(line, "")
-
-	// 检查是否包含CSS属性
-	if cssPropertyPattern.MatchString(line) {
-		return true
+	// 字面量预过滤：CSS属性必含';'，CSS选择器必含'{'，都没有时无需进入正则引擎
+	if !strings.ContainsAny(line, ";{") {
+		return false
 	}
 
-	// 检查是否包含CSS选择器
-	if cssSelectorPattern.MatchString(line) {
-		return true
+	// 去除CSS注释
+	if strings.Contains(line, "/*") {
+		line = cssCommentPattern.ReplaceAllString(line, "")
 	}
 
-	return false
+	// 检查是否包含CSS属性或CSS选择器
+	return cssLinePattern.MatchString(line)
 }
 
 // IsValidBrackets 用于判断text字符串中括号是否完整
 func IsValidBrackets(text string) bool {
-	stack := make([]rune, 0)
-	mapping := map[rune]rune{
-		')': '(',
-		'}': '{',
-		']': '[',
-	}
-
-	for _, char := range text {
-		if closer, ok := mapping[char]; ok {
-			if len(stack) == 0 || stack[len(stack)-1] != closer {
-				return false
-			}
-			stack = stack[:len(stack)-1]
-		} else if strings.ContainsRune("({[", char) {
-			stack = append(stack, char)
+	// 括号都是ASCII字符，按字节扫描即可，无需逐个解码rune和查表
+	stack := make([]byte, 0, 16)
+	for i := 0; i < len(text); i++ {
+		var opener byte
+		switch text[i] {
+		case '(', '{', '[':
+			stack = append(stack, text[i])
+			continue
+		case ')':
+			opener = '('
+		case '}':
+			opener = '{'
+		case ']':
+			opener = '['
+		default:
+			continue
+		}
+		if len(stack) == 0 || stack[len(stack)-1] != opener {
+			return false
 		}
+		stack = stack[:len(stack)-1]
 	}
 
 	return len(stack) == 0
 }
 
-// GetLeftPairedSymbols 获取左括号映射
-func GetLeftPairedSymbols() map[string]string {
-	return map[string]string{
+// 符号映射表在包初始化时构建一次，包内只读使用；导出的Get函数返回副本，调用方修改副本不影响后续请求
+var (
+	leftPairedSymbols = map[string]string{
 		"(": ")",
 		"[": "]",
 		"{": "}",
 	}
+	rightPairedSymbols = invertSymbols(leftPairedSymbols)
+	quotesSymbols      = map[string]string{
+		"\"": "\"",
+		"'":  "'",
+	}
+)
+
+// invertSymbols 生成键值互换的符号映射
+func invertSymbols(symbols map[string]string) map[string]string {
+	inverted := make(map[string]string, len(symbols))
+	for k, v := range symbols {
+		inverted[v] = k
+	}
+	return inverted
 }
 
-// GetRightPairedSymbols 获取右括号映射
+// GetLeftPairedSymbols 获取左括号映射（副本）
+func GetLeftPairedSymbols() map[string]string {
+	return maps.Clone(leftPairedSymbols)
+}
+
+// GetRightPairedSymbols 获取右括号映射（副本）
 func GetRightPairedSymbols() map[string]string {
-	rightSymbols := make(map[string]string)
-	leftSymbols := GetLeftPairedSymbols()
-	for k, v := range leftSymbols {
-		rightSymbols[v] = k
-	}
-	return rightSymbols
+	return maps.Clone(rightPairedSymbols)
 }
 
-// GetQuotesSymbols 获取引号符号映射
+// GetQuotesSymbols 获取引号符号映射（副本）
 func GetQuotesSymbols() map[string]string {
-	return map[string]string{
-		"\"": "\"",
-		"'":  "'",
-	}
+	return maps.Clone(quotesSymbols)
 }
 
 // GetBoundarySymbols 获取边界符号
@@ -846,36 +961,37 @@ func GetBoundarySymbols() []string {
 
 // CountPairedSymbols 统计成对出现的符号
 func CountPairedSymbols(text string) map[string]int {
-	symbolsMap := make(map[string]int)
-	rightSymbols := GetRightPairedSymbols()
-
-	for _, char := range text {
-		charStr := string(char)
-		// 忽略孤立的右括号
-		if expectedLeft, ok := rightSymbols[charStr]; ok {
-			if symbolsMap[expectedLeft] == 0 {
-				continue
-			}
+	// 只有左括号计数；右括号（无论是否孤立）都不计入，一次判断即可，无需再查左右两张映射表
+	// 括号均为ASCII，按字节扫描并按下标计数，最后才构建映射，扫描时不做字符串哈希
+	const leftBrackets = "([{"
+	var counts [len(leftBrackets)]int
+	for i := 0; i < len(text); i++ {
+		if k := strings.IndexByte(leftBrackets, text[i]); k >= 0 {
+			counts[k]++
 		}
+	}
 
-		leftSymbols := GetLeftPairedSymbols()
-		if _, ok := leftSymbols[charStr]; ok {
-			symbolsMap[charStr]++
+	symbolsMap := make(map[string]int, len(leftBrackets))
+	for k, n := range counts {
+		if n > 0 {
+			symbolsMap[leftBrackets[k:k+1]] = n
 		}
 	}
-
 	return symbolsMap
 }
 
 // RemoveStrings 删除代码行中包含字符串的部分
 func RemoveStrings(codeLine string) string {
+	// 不含引号的合法UTF-8文本无需处理，直接返回原文
+	if !strings.ContainsAny(codeLine, "\"'") && utf8.ValidString(codeLine) {
+		return codeLine
+	}
+
 	result := make([]rune, 0)
 	inString := false
 	var quoteChar rune
 	buffer := make([]rune, 0)
 
-	quotesSymbols := GetQuotesSymbols()
-
 	for _, char := range codeLine {
 		if !inString {
 			if _, ok := quotesSymbols[string(char)]; ok {
@@ -902,46 +1018,43 @@ func RemoveStrings(codeLine string) string {
 	return string(result)
 }
 
+// bracketKinds 按字节查括号种类：左括号为k+1，右括号为-(k+1)，k为"([{"中的下标，其它字节为0
+var bracketKinds = func() (kinds [256]int8) {
+	for k, c := range []byte("([{") {
+		kinds[c] = int8(k + 1)
+	}
+	for k, c := range []byte(")]}") {
+		kinds[c] = -int8(k + 1)
+	}
+	return
+}()
+
 // IsCursorInParentheses 判断光标是否在括号内
+// 前缀、后缀各只扫描一遍，三种括号的计数同时进行
 func IsCursorInParentheses(prefix, suffix string) bool {
-	findParenthesis := func(text string, symbol string, isReverse bool) int {
-		count := 0
-		leftSymbols := GetLeftPairedSymbols()
-
-		if isReverse {
-			runes := []rune(text)
-			for i := len(runes) - 1; i >= 0; i-- {
-				if string(runes[i]) == leftSymbols[symbol] {
-					count++
-				}
-				if string(runes[i]) == symbol {
-					if count <= 0 {
-						return len(runes) - 1 - i
-					}
-					count--
-				}
-			}
-		} else {
-			for i, char := range text {
-				if string(char) == leftSymbols[symbol] {
-					count++
-				}
-				if string(char) == symbol {
-					if count <= 0 {
-						return i
-					}
-					count--
-				}
+	var depth [3]int
+	var leftFound uint8 // 第k位表示第k种括号在前缀中有未闭合的左括号
+
+	// 反向扫描前缀，查找每种括号未闭合的左括号；三种都已找到时无需继续
+	for i := len(prefix) - 1; i >= 0 && leftFound != 0b111; i-- {
+		kind := bracketKinds[prefix[i]]
+		if kind < 0 {
+			depth[-kind-1]++
+		} else if kind > 0 {
+			if k := kind - 1; depth[k] <= 0 {
+				leftFound |= 1 << k
+			} else {
+				depth[k]--
 			}
 		}
-		return -1
+	}
+	if leftFound == 0 {
+		return false
 	}
 
-	leftSymbols := GetLeftPairedSymbols()
-	for leftSymbol, rightSymbol := range leftSymbols {
-		leftParenthesisIndex := findParenthesis(prefix, leftSymbol, true)
-		rightParenthesisIndex := findParenthesis(suffix, rightSymbol, false)
-		if leftParenthesisIndex != -1 && rightParenthesisIndex != -1 {
+	// 正向扫描后缀，查找每种括号的右括号
+	for i := 0; i < len(suffix); i++ {
+		if kind := bracketKinds[suffix[i]]; kind < 0 && leftFound&(1<<(-kind-1)) != 0 {
 			return true
 		}
 	}
@@ -951,34 +1064,19 @@ func IsCursorInParentheses(prefix, suffix string) bool {
 
 // IsCursorInString 判断光标是否在字符串内
 func IsCursorInString(cursorPrefix string) bool {
-	quotesSymbols := GetQuotesSymbols()
-	quotesCount := make(map[string]int)
-
-	for k := range quotesSymbols {
-		quotesCount[k] = 0
-	}
-
-	i := 0
-	runes := []rune(cursorPrefix)
-	for i < len(runes) {
-		if runes[i] == '\\' {
-			i += 2
-			continue
+	// 单次扫描同时统计单、双引号数量，转义字符跳过
+	doubleQuotes, singleQuotes := 0, 0
+	for i := 0; i < len(cursorPrefix); i++ {
+		switch cursorPrefix[i] {
+		case '\\':
+			i++
+		case '"':
+			doubleQuotes++
+		case '\'':
+			singleQuotes++
 		}
-
-		charStr := string(runes[i])
-		if _, ok := quotesSymbols[charStr]; ok {
-			quotesCount[charStr]++
-		}
-		i++
 	}
 
 	// 如果引号数量为奇数，则光标在字符串内
-	for _, count := range quotesCount {
-		if count%2 == 1 {
-			return true
-		}
-	}
-
-	return false
+	return doubleQuotes%2 == 1 || singleQuotes%2 == 1
 }
@@ -0,0 +1,176 @@
+package completions
+
+import (
+	"strings"
+	"testing"
+)
+
+// judgePrefixFullLineRepetitiveReference 切分整个前缀逐行比较的原实现，作为judgePrefixFullLineRepetitive的对照
+func judgePrefixFullLineRepetitiveReference(completionText, prefix string) bool {
+	if len(prefix) == 0 || len(completionText) == 0 {
+		return false
+	}
+
+	splitPrefixText := strings.Split(prefix, "\n")
+	linePrefixText := splitPrefixText[len(splitPrefixText)-1]
+	completionText = linePrefixText + completionText
+
+	var nonEmptyCompletionText []string
+	for _, line := range strings.Split(completionText, "\n") {
+		if strings.TrimSpace(line) != "" {
+			nonEmptyCompletionText = append(nonEmptyCompletionText, line)
+		}
+	}
+
+	var nonEmptyPrefixText []string
+	for _, line := range splitPrefixText[:len(splitPrefixText)-1] {
+		if strings.TrimSpace(line) != "" {
+			nonEmptyPrefixText = append(nonEmptyPrefixText, line)
+		}
+	}
+
+	if len(nonEmptyCompletionText) > len(nonEmptyPrefixText) {
+		return false
+	}
+	nonEmptyPrefixText = nonEmptyPrefixText[len(nonEmptyPrefixText)-len(nonEmptyCompletionText):]
+	for i := range nonEmptyCompletionText {
+		if nonEmptyCompletionText[i] != nonEmptyPrefixText[i] {
+			return false
+		}
+	}
+	return true
+}
+
+func FuzzJudgePrefixFullLineRepetitive(f *testing.F) {
+	seeds := []struct{ completion, prefix string }{
+		{"b()\n", "a()\nb()\n"},
+		{"x = 1\ny = 2", "x = 1\ny = 2\n"},
+		{"  \n", "code\n"},
+		{"z", "no newline"},
+		{"foo\n\nbar", "foo\n  \nbar\nfoo\n\n"},
+		{"\t\n", "\n\n"},
+	}
+	for _, s := range seeds {
+		f.Add(s.completion, s.prefix)
+	}
+	f.Fuzz(func(t *testing.T, completion, prefix string) {
+		got := judgePrefixFullLineRepetitive(completion, prefix)
+		want := judgePrefixFullLineRepetitiveReference(completion, prefix)
+		if got != want {
+			t.Errorf("judgePrefixFullLineRepetitive(%q, %q) = %v, want %v", completion, prefix, got, want)
+		}
+	})
+}
+
+// cutPrefixOverlapReference 切分整个前缀的原实现，作为cutPrefixOverlap的对照
+func cutPrefixOverlapReference(text, prefix string, cutLine int) string {
+	stripText := strings.TrimSpace(text)
+	if len(stripText) == 0 {
+		return text
+	}
+	splitText := strings.Split(stripText, "\n")
+	if len(splitText) < 3 {
+		if judgePrefixFullLineRepetitive(text, prefix) {
+			return ""
+		}
+		return text
+	}
+
+	splitPrefix := strings.Split(strings.TrimSpace(prefix), "\n")
+	matchLine := min(len(splitPrefix), len(splitText))
+	patternTextList := splitText[:matchLine]
+	for i := 0; i < cutLine && i < len(splitPrefix); i++ {
+		startIdx := max(len(splitPrefix)-matchLine-i, 0)
+		endIdx := len(splitPrefix) - i
+		if startIdx > endIdx {
+			continue
+		}
+		curMatchTextList := splitPrefix[startIdx:endIdx]
+		matchCount := 0
+		continueFlag := true
+		for j := 0; j < len(curMatchTextList) && j < len(patternTextList); j++ {
+			if strings.TrimSpace(curMatchTextList[j]) == strings.TrimSpace(patternTextList[j]) {
+				matchCount++
+				if matchCount == 3 && continueFlag {
+					return ""
+				}
+				if matchCount*5 >= matchLine*3 {
+					return ""
+				}
+			} else {
+				continueFlag = false
+			}
+		}
+	}
+	return text
+}
+
+func FuzzCutPrefixOverlap(f *testing.F) {
+	seeds := []struct {
+		text, prefix string
+		cutLine      int
+	}{
+		{"a\nb\nc\nd", "x\na\nb\nc\n", 3},
+		{"a\nb\nc", "a\nq\nb\nc\nz", 5},
+		{"one\ntwo\nthree", "", 2},
+		{"  \n", "p", 1},
+		{"l1\nl2\nl3\nl4\nl5", "l0\nl1\nl2\nl3\nl4\nl5\nl6\nl7", 0},
+		{"x\ny", "x\n", 4},
+	}
+	for _, s := range seeds {
+		f.Add(s.text, s.prefix, s.cutLine)
+	}
+	f.Fuzz(func(t *testing.T, text, prefix string, cutLine int) {
+		cutLine %= 16 // 调用方传入的是较小的行数
+		got := cutPrefixOverlap(text, prefix, "", cutLine)
+		want := cutPrefixOverlapReference(text, prefix, cutLine)
+		if got != want {
+			t.Errorf("cutPrefixOverlap(%q, %q, %d) = %q, want %q", text, prefix, cutLine, got, want)
+		}
+	})
+}
+
+// isCursorInParenthesesReference 逐字节在括号字符串中查找的原实现，作为IsCursorInParentheses的对照
+func isCursorInParenthesesReference(prefix, suffix string) bool {
+	const leftBrackets, rightBrackets = "([{", ")]}"
+	var depth [3]int
+	var leftFound [3]bool
+	for i := len(prefix) - 1; i >= 0; i-- {
+		if k := strings.IndexByte(rightBrackets, prefix[i]); k >= 0 {
+			depth[k]++
+		} else if k := strings.IndexByte(leftBrackets, prefix[i]); k >= 0 {
+			if depth[k] <= 0 {
+				leftFound[k] = true
+			} else {
+				depth[k]--
+			}
+		}
+	}
+	for i := 0; i < len(suffix); i++ {
+		if k := strings.IndexByte(rightBrackets, suffix[i]); k >= 0 && leftFound[k] {
+			return true
+		}
+	}
+	return false
+}
+
+func FuzzIsCursorInParentheses(f *testing.F) {
+	seeds := []struct{ prefix, suffix string }{
+		{"foo(a, ", ")"},
+		{"x = [1, (2", "]"},
+		{"{ if (a) { b }", "}"},
+		{"f(g(h(", ")]}"},
+		{"no brackets", "none"},
+		{"a)(b", "}"},
+	}
+	for _, s := range seeds {
+		f.Add(s.prefix, s.suffix)
+	}
+	f.Fuzz(func(t *testing.T, prefix, suffix string) {
+		got := IsCursorInParentheses(prefix, suffix)
+		want := isCursorInParenthesesReference(prefix, suffix)
+		if got != want {
+			t.Errorf("IsCursorInParentheses(%q, %q) = %v, want %v", prefix, suffix, got, want)
+		}
+	})
+}
@@ -1,6 +1,7 @@
 package logger
 
 import (
+	"os"
 	"time"
 
 	"go.uber.org/zap"
@@ -58,19 +59,63 @@ func SetMode(mode string) {
 		config.EncoderConfig.EncodeTime = func(t time.Time, enc zapcore.PrimitiveArrayEncoder) {
 			enc.AppendString(t.Local().Format("2006-01-02 15:04:05.000"))
 		}
-		l, err = config.Build()
+		l = newBufferedLogger(config)
 	}
 	if err != nil {
 		panic(err)
 	}
+	// Logger与全局logger使用同一个core，经logger.Fatal等输出的日志也会先刷新缓冲区再退出
+	Logger = l
 	zap.ReplaceGlobals(l)
 }
 
-// Sync 刷新所有日志到输出
+// 缓冲日志的最长刷新间隔
+const bufferedFlushInterval = time.Second
+
+// 生产模式下日志的缓冲写入器，由Stop停止其后台刷新协程
+var bufferedOutput *zapcore.BufferedWriteSyncer
+
+/**
+ * 按生产配置创建带写缓冲的logger
+ * @param {zap.Config} config - 生产模式的zap配置
+ * @returns {*zap.Logger} 返回日志先写入缓冲区、定时批量输出到stderr的logger
+ * @description
+ * - 每个请求都会记录日志，逐条直接写stderr会让请求协程争用输出锁并各自发起系统调用
+ * - 缓冲区写满或到达刷新间隔时统一输出；Panic、Fatal级别的日志由zap立即刷新
+ * - 保留生产配置的采样、调用位置和错误堆栈设置
+ * - 退出前需调用Stop刷新缓冲区并停止后台刷新协程
+ * - 未被recover的panic会直接终止进程，不经过退出流程，此时最近最多bufferedFlushInterval（1秒）的日志会丢失；
+ *   gin的Recovery中间件捕获的请求处理panic不受影响
+ */
+func newBufferedLogger(config zap.Config) *zap.Logger {
+	ws := &zapcore.BufferedWriteSyncer{
+		WS:            zapcore.Lock(os.Stderr),
+		FlushInterval: bufferedFlushInterval,
+	}
+	bufferedOutput = ws
+	core := zapcore.NewCore(zapcore.NewJSONEncoder(config.EncoderConfig), ws, config.Level)
+	if config.Sampling != nil {
+		core = zapcore.NewSamplerWithOptions(core, time.Second, config.Sampling.Initial, config.Sampling.Thereafter)
+	}
+	return zap.New(core,
+		zap.AddCaller(),
+		zap.AddStacktrace(zapcore.ErrorLevel),
+		zap.ErrorOutput(zapcore.Lock(os.Stderr)))
+}
+
+// Sync 刷新所有日志到输出，包括SetMode设置的缓冲区
 func Sync() {
 	Logger.Sync()
 }
 
+// Stop 刷新所有日志并停止缓冲区的后台刷新协程，在进程退出前调用
+func Stop() {
+	Logger.Sync()
+	if bufferedOutput != nil {
+		bufferedOutput.Stop()
+	}
+}
+
 // 便捷函数，直接调用全局 logger 的方法
 
 // Info 记录信息级别日志
@@ -78,6 +78,55 @@ func RecordCompletionDuration(model string, status string, queue, context, llm,
 	completionDurations.WithLabelValues(model, status, "total").Observe(float64(total))
 }
 
+// 同一(model, status)标签组合下，RecordCompletion用到的全部指标
+type completionObservers struct {
+	queue, context, llm, total prometheus.Observer
+	requests                   prometheus.Counter
+	inputTokens, outputTokens  prometheus.Observer
+}
+
+type completionLabels struct {
+	model  string
+	status string
+}
+
+// 模型和状态的取值都很有限，按标签组合缓存指标，避免每次请求重复按标签查找
+var completionObserverCache sync.Map
+
+func getCompletionObservers(model string, status string) *completionObservers {
+	key := completionLabels{model: model, status: status}
+	if o, ok := completionObserverCache.Load(key); ok {
+		return o.(*completionObservers)
+	}
+	o := &completionObservers{
+		queue:        completionDurations.WithLabelValues(model, status, "queue"),
+		context:      completionDurations.WithLabelValues(model, status, "context"),
+		llm:          completionDurations.WithLabelValues(model, status, "llm"),
+		total:        completionDurations.WithLabelValues(model, status, "total"),
+		requests:     completionRequestsTotal.WithLabelValues(model, status),
+		inputTokens:  completionTokens.WithLabelValues(model, string(TokenTypeInput)),
+		outputTokens: completionTokens.WithLabelValues(model, string(TokenTypeOutput)),
+	}
+	actual, _ := completionObserverCache.LoadOrStore(key, o)
+	return actual.(*completionObservers)
+}
+
+// 一次性记录单个补全请求的全部指标：各阶段耗时、请求计数、输入输出token数，只加锁一次
+func RecordCompletion(model string, status string, queue, context, llm, total int64, inputTokens, outputTokens int) {
+	o := getCompletionObservers(model, status)
+
+	metricsMutex.Lock()
+	defer metricsMutex.Unlock()
+
+	o.queue.Observe(float64(queue))
+	o.context.Observe(float64(context))
+	o.llm.Observe(float64(llm))
+	o.total.Observe(float64(total))
+	o.requests.Inc()
+	o.inputTokens.Observe(float64(inputTokens))
+	o.outputTokens.Observe(float64(outputTokens))
+}
+
 // 记录每次请求的输入和输出token数分布
 func RecordCompletionTokens(model string, tokenType TokenType, tokenCount int) {
 	metricsMutex.Lock()
@@ -95,19 +144,25 @@ func IncrementCompletionRequests(model string, status string) {
 }
 
 // 更新当前各模型池并发的连接总数
+// Gauge.Set本身是原子写入，无需加全局锁；调用方持有队列锁，不应再等待其它指标的记录
 func UpdateCompletionConcurrent(count int) {
-	metricsMutex.Lock()
-	defer metricsMutex.Unlock()
-
 	completionConcurrent.Set(float64(count))
 }
 
+// 各模型池的并发连接数指标，按模型缓存，每个请求更新两次无需重复按标签查找
+var concurrentGaugeCache sync.Map
+
+func getConcurrentGauge(model string) prometheus.Gauge {
+	if g, ok := concurrentGaugeCache.Load(model); ok {
+		return g.(prometheus.Gauge)
+	}
+	g, _ := concurrentGaugeCache.LoadOrStore(model, completionConcurrentByModel.WithLabelValues(model))
+	return g.(prometheus.Gauge)
+}
+
 // 更新指定模型池的并发连接数
 func UpdateCompletionConcurrentByModel(model string, count int) {
-	metricsMutex.Lock()
-	defer metricsMutex.Unlock()
-
-	completionConcurrentByModel.WithLabelValues(model).Set(float64(count))
+	getConcurrentGauge(model).Set(float64(count))
 }
 
 // 返回Prometheus指标数据的HTTP处理器
@@ -1,6 +1,8 @@
 package model
 
-//	前置模块处理完毕后给到模型进行调用的参数信息
+import "encoding/json"
+
+// 前置模块处理完毕后给到模型进行调用的参数信息
 type CompletionParameter struct {
 	CompletionID string   `json:"completionID"` // 补全请求ID，用于唯一标识一次补全请求
 	ClientID     string   `json:"clientID"`     // 用户ID，唯一标识发起补全请求的用户
@@ -13,12 +15,14 @@ type CompletionParameter struct {
 	Suffix       string   `json:"suffix"`       // 后缀
 	CodeContext  string   `json:"context"`      // 上下文
 	Verbose      bool     `json:"verbose"`      // 是否需要更详细的回复，帮助调试
+	PromptTokens int      `json:"-"`            // 截断阶段统计的前缀+上下文token数，0表示未统计
 }
 
+// 输入输出保存为已编码的JSON，直接复用模型请求体和响应体，无需再解码/编码map
 type CompletionVerbose struct {
-	Id     string                 `json:"id"`
-	Input  map[string]interface{} `json:"input"`
-	Output map[string]interface{} `json:"output,omitempty"`
+	Id     string          `json:"id"`
+	Input  json.RawMessage `json:"input" swaggertype:"object"`
+	Output json.RawMessage `json:"output,omitempty" swaggertype:"object"`
 }
 
 type CompletionStatus string
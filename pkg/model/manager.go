@@ -29,15 +29,9 @@ func GetAutoModel() LLM {
 	if modelLen == 0 {
 		panic(manager)
 	}
-	// 采用轮转法选择模型进行响应
-	var model LLM
-	if manager.index < modelLen {
-		model = manager.models[manager.index]
-		manager.index++
-	} else {
-		manager.index = 1
-		model = manager.models[0]
-	}
+	// 采用轮转法选择模型进行响应，取模推进下标，无需分支回绕
+	model := manager.models[manager.index%modelLen]
+	manager.index = (manager.index + 1) % modelLen
 	return model
 }
 
@@ -54,11 +48,38 @@ func GetModel(idx int) LLM {
 var manager = &OpenAIModelManager{}
 
 func Init(cfgModels []config.ModelConfig) error {
-	models := make([]LLM, 0)
+	// 同一分词器文件只加载一次，由使用它的模型共享；不同文件相互独立，并行加载
+	paths := make([]string, 0, len(cfgModels))
+	seen := make(map[string]bool, len(cfgModels))
+	for _, c := range cfgModels {
+		if !seen[c.TokenizerPath] {
+			seen[c.TokenizerPath] = true
+			paths = append(paths, c.TokenizerPath)
+		}
+	}
+	tokens := make(map[string]*tokenizers.Tokenizer, len(paths))
+	var tokensMutex sync.Mutex
+	var wg sync.WaitGroup
+	for _, path := range paths {
+		wg.Add(1)
+		go func(path string) {
+			defer wg.Done()
+			token, err := tokenizers.NewTokenizer(path)
+			if err != nil {
+				zap.L().Error("init tokenizer error", zap.String("tokenizerPath", path), zap.Error(err))
+				return
+			}
+			tokensMutex.Lock()
+			tokens[path] = token
+			tokensMutex.Unlock()
+		}(path)
+	}
+	wg.Wait()
+
+	models := make([]LLM, 0, len(cfgModels))
 	for _, c := range cfgModels {
-		token, err := tokenizers.NewTokenizer(c.TokenizerPath)
-		if err != nil {
-			zap.L().Error("init tokenizer error", zap.String("tokenizerPath", c.TokenizerPath), zap.Error(err))
+		token := tokens[c.TokenizerPath]
+		if token == nil {
 			continue
 		}
 		newLLM, exists := modelDefs[c.Provider]
@@ -9,18 +9,21 @@ import (
 	"fmt"
 	"io"
 	"net/http"
-	"strings"
 )
 
 type OpenAIModel struct {
 	cfg       *config.ModelConfig
 	tokenizer *tokenizers.Tokenizer
+	client    *http.Client // 复用的HTTP客户端，保持与模型服务的连接
 }
 
 func NewOpenAIModel(c *config.ModelConfig, t *tokenizers.Tokenizer) LLM {
 	return &OpenAIModel{
 		cfg:       c,
 		tokenizer: t,
+		client: &http.Client{
+			Timeout: c.Timeout,
+		},
 	}
 }
 
@@ -57,37 +60,48 @@ func (m *OpenAIModel) getFimPrompt(prefix, suffix, codeContext string, cfg *conf
 	return cfg.FimBegin + codeContext + "\n" + prefix + cfg.FimHole + suffix + cfg.FimEnd
 }
 
+// 模型补全接口的请求体，一次构建完成后编码，无需先组装map再反射编码
+// 字段按名称字母序排列，编码结果与原先编码map时完全一致
+type completionsRequest struct {
+	MaxTokens   int      `json:"max_tokens"`
+	Model       string   `json:"model"`
+	Prompt      string   `json:"prompt"`
+	Stop        []string `json:"stop"`
+	Stream      bool     `json:"stream"`
+	Suffix      string   `json:"suffix,omitempty"` // FIM模式下后缀已拼入prompt，不单独发送
+	Temperature float32  `json:"temperature"`
+}
+
 func (m *OpenAIModel) Completions(ctx context.Context, p *CompletionParameter) (*CompletionResponse, *CompletionVerbose, CompletionStatus, error) {
 	var prefix string
 	if m.cfg.FimMode {
 		prefix = m.getFimPrompt(p.Prefix, p.Suffix, p.CodeContext, m.cfg)
 	} else {
 		if p.CodeContext != "" {
-			prefix = strings.Join([]string{p.CodeContext, p.Prefix}, "\n")
+			prefix = p.CodeContext + "\n" + p.Prefix
 		} else {
 			prefix = p.Prefix
 		}
 	}
-	maxTokens := min(p.MaxTokens, m.cfg.MaxOutput)
-	data := map[string]interface{}{
-		"model":       m.cfg.ModelName,
-		"prompt":      prefix,
-		"stop":        p.Stop,
-		"temperature": p.Temperature,
-		"max_tokens":  maxTokens,
-		"stream":      false,
+	data := completionsRequest{
+		MaxTokens:   min(p.MaxTokens, m.cfg.MaxOutput),
+		Model:       m.cfg.ModelName,
+		Prompt:      prefix,
+		Stop:        p.Stop,
+		Stream:      false,
+		Temperature: p.Temperature,
 	}
-	if !m.cfg.FimMode && p.Suffix != "" {
-		data["suffix"] = p.Suffix
+	if !m.cfg.FimMode {
+		data.Suffix = p.Suffix
 	}
 	var verbose CompletionVerbose
 	verbose.Id = m.cfg.ModelTitle
-	verbose.Input = data
-	// 将data转换为JSON
+	// 将data转换为JSON，编码结果同时作为详细信息的输入
 	jsonData, err := json.Marshal(data)
 	if err != nil {
 		return nil, &verbose, StatusServerError, err
 	}
+	verbose.Input = jsonData
 
 	// 创建HTTP请求
 	req, err := http.NewRequestWithContext(ctx, "POST", m.cfg.CompletionsUrl, bytes.NewBuffer(jsonData))
@@ -95,15 +109,14 @@ func (m *OpenAIModel) Completions(ctx context.Context, p *CompletionParameter) (
 		return nil, &verbose, StatusReqError, err
 	}
 
-	// 设置请求头
-	req.Header.Set("Content-Type", "application/json")
-	req.Header.Set("Authorization", m.cfg.Authorization)
+	// 设置请求头，键名已是规范形式，一次性构建，无需逐个Set
+	req.Header = http.Header{
+		"Content-Type":  {"application/json"},
+		"Authorization": {m.cfg.Authorization},
+	}
 
 	// 发送请求
-	client := &http.Client{
-		Timeout: m.cfg.Timeout,
-	}
-	resp, err := client.Do(req)
+	resp, err := m.client.Do(req)
 	if err != nil {
 		status := StatusServerError
 		switch err {
@@ -119,7 +132,10 @@ func (m *OpenAIModel) Completions(ctx context.Context, p *CompletionParameter) (
 	if err != nil {
 		return nil, &verbose, StatusServerError, err
 	}
-	json.Unmarshal(body, &verbose.Output)
+	// 模型输出原样保留，只校验是否为合法JSON，不再额外解码为map
+	if json.Valid(body) {
+		verbose.Output = body
+	}
 	if resp.StatusCode < 200 || resp.StatusCode >= 300 {
 		return nil, &verbose, StatusModelError, fmt.Errorf("Invalid StatusCode(%d)", resp.StatusCode)
 	}
@@ -0,0 +1,62 @@
+package model
+
+import (
+	"bytes"
+	"encoding/json"
+	"testing"
+)
+
+// completionsRequestReference 原先组装map后编码的请求体，作为completionsRequest编码结果的对照
+func completionsRequestReference(modelName, prompt, suffix string, stop []string,
+	temperature float32, maxTokens int, fimMode bool) map[string]interface{} {
+	data := map[string]interface{}{
+		"model":       modelName,
+		"prompt":      prompt,
+		"stop":        stop,
+		"temperature": temperature,
+		"max_tokens":  maxTokens,
+		"stream":      false,
+	}
+	if !fimMode && suffix != "" {
+		data["suffix"] = suffix
+	}
+	return data
+}
+
+func FuzzCompletionsRequestEncoding(f *testing.F) {
+	f.Add("deepseek-coder", "def add(a, b):\n", "\n\nprint(add(1, 2))", "\n\n", "<|endoftext|>", uint8(2), float32(0.1), 50, false)
+	f.Add("qwen", "<fim_prefix>x", "", "", "", uint8(0), float32(0), 0, true)
+	f.Add("", " <b>&\"", "\x00\xff", "\t", "", uint8(1), float32(-1.5e-7), -1, false)
+	f.Fuzz(func(t *testing.T, modelName, prompt, suffix, stop1, stop2 string, stopCount uint8,
+		temperature float32, maxTokens int, fimMode bool) {
+		var stop []string
+		switch stopCount % 4 {
+		case 1:
+			stop = []string{}
+		case 2:
+			stop = []string{stop1}
+		case 3:
+			stop = []string{stop1, stop2}
+		}
+		data := completionsRequest{
+			MaxTokens:   maxTokens,
+			Model:       modelName,
+			Prompt:      prompt,
+			Stop:        stop,
+			Stream:      false,
+			Temperature: temperature,
+		}
+		if !fimMode {
+			data.Suffix = suffix
+		}
+		got, gotErr := json.Marshal(data)
+		want, wantErr := json.Marshal(completionsRequestReference(modelName, prompt, suffix, stop,
+			temperature, maxTokens, fimMode))
+		if (gotErr != nil) != (wantErr != nil) {
+			t.Fatalf("error mismatch: got %v, want %v", gotErr, wantErr)
+		}
+		if !bytes.Equal(got, want) {
+			t.Errorf("encoding mismatch:\ngot  %s\nwant %s", got, want)
+		}
+	})
+}
@@ -6,6 +6,7 @@ import (
 
 type SimpleParser struct {
 	language string
+	check    func(code string) bool // 创建时按语言选定的语法检查函数
 }
 
 /**
@@ -16,14 +17,54 @@ type SimpleParser struct {
  * - 根据指定的编程语言创建简化版本的分析器实例
  * - 支持多种编程语言的基本语法检查
  * - 实现Parser接口，提供基础的代码分析功能
+ * - 创建时即确定语法检查函数，避免每次检查都重新判断语言
  * @example
  * parser := NewSimpleParser("python")
  * isValid := parser.IsCodeSyntax("print('Hello World')")
  */
 func NewSimpleParser(language string) Parser {
-	return &SimpleParser{
+	t := &SimpleParser{
 		language: language,
 	}
+	switch strings.ToLower(language) {
+	case "python":
+		t.check = t.checkPythonSyntax
+	case "javascript", "typescript":
+		t.check = t.checkJavaScriptSyntax
+	case "go":
+		t.check = t.checkGoSyntax
+	}
+	return t
+}
+
+// simpleParsers 有语法检查的语言各自的SimpleParser实例，启动时创建，之后只读，可被并发共享
+var simpleParsers = map[string]Parser{
+	"python":     NewSimpleParser("python"),
+	"javascript": NewSimpleParser("javascript"),
+	"typescript": NewSimpleParser("typescript"),
+	"go":         NewSimpleParser("go"),
+}
+
+// uncheckedParser 其余语言共用的分析器，不做语法检查
+var uncheckedParser = NewSimpleParser("")
+
+/**
+ * 获取指定语言的共享简化版本分析器
+ * @param {string} language - 编程语言标识符，大小写不敏感
+ * @returns {Parser} 返回该语言对应的分析器实例
+ * @description
+ * - 有语法检查的语言各用一个预先创建的实例，其余语言共用不做检查的实例
+ * - 查找只读映射，无需加锁，也不会随请求中出现的新语言名增长
+ * - 适用于每次补全都需要分析器的热路径，避免重复创建
+ * @example
+ * parser := GetSimpleParser("Python")
+ * isValid := parser.IsCodeSyntax("print('Hello World')")
+ */
+func GetSimpleParser(language string) Parser {
+	if p, ok := simpleParsers[strings.ToLower(language)]; ok {
+		return p
+	}
+	return uncheckedParser
 }
 
 /**
@@ -41,16 +82,10 @@ func NewSimpleParser(language string) Parser {
  * // isValid = true
  */
 func (t *SimpleParser) IsCodeSyntax(code string) bool {
-	switch strings.ToLower(t.language) {
-	case "python":
-		return t.checkPythonSyntax(code)
-	case "javascript", "typescript":
-		return t.checkJavaScriptSyntax(code)
-	case "go":
-		return t.checkGoSyntax(code)
-	default:
+	if t.check == nil {
 		return true // 对于不支持的语言，默认返回true
 	}
+	return t.check(code)
 }
 
 /**
@@ -62,6 +97,8 @@ func (t *SimpleParser) IsCodeSyntax(code string) bool {
  * @description
  * - 通过逐步截断候选文本来找到语法正确的代码片段
  * - 从后向前逐个字符删除，直到找到语法正确的代码
+ * - 先做廉价的空白判断，剩余内容全为空白时提前结束，不再拼接和检查整段代码
+ * - 不支持语法检查的语言直接返回去除末尾空白的候选文本，不拼接整段代码
  * - 使用前缀和后缀进行完整的语法检查
  * - 如果无法找到有效代码，返回原始候选文本
  * @example
@@ -73,12 +110,23 @@ func (t *SimpleParser) InterceptSyntaxErrorCode(choicesText, prefix, suffix stri
 	if choicesText == "" {
 		return choicesText
 	}
+	// 不做语法检查的语言，首次检查必然通过，结果与截断前相同，无需拼接前缀和后缀
+	if t.check == nil {
+		if strings.TrimSpace(choicesText) == "" {
+			return choicesText
+		}
+		return strings.TrimRight(choicesText, "\n\r\t ")
+	}
 
 	cutCode := choicesText
 	maxCutCount := t.GetLastKLineStrLen(cutCode, 1)
 
 	for i := 0; i < maxCutCount; i++ {
-		if t.IsCodeSyntax(prefix+cutCode+suffix) && strings.TrimSpace(cutCode) != "" {
+		// 截断只会让cutCode变短，一旦只剩空白，后续候选也都是空白，无需再做语法检查
+		if strings.TrimSpace(cutCode) == "" {
+			break
+		}
+		if t.IsCodeSyntax(prefix + cutCode + suffix) {
 			return strings.TrimRight(cutCode, "\n\r\t ")
 		}
 
@@ -133,6 +181,7 @@ func (t *SimpleParser) ExtractBlockPrefixSuffix(choicesText, prefix, suffix stri
  * - 使用特殊标记符来准确定位代码块边界
  * - 基于行号提取代码块，获取前后缀内容
  * - 选取标记符周围的代码行作为提取范围
+ * - 常规情况下直接截取前缀末尾和后缀开头的行，不拼接完整代码
  * - 如果提取失败，返回原始前缀和后缀
  * @example
  * parser := NewSimpleParser("python")
@@ -140,6 +189,12 @@ func (t *SimpleParser) ExtractBlockPrefixSuffix(choicesText, prefix, suffix stri
  */
 func (t *SimpleParser) ExtractAccurateBlockPrefixSuffix(prefix, suffix string) (string, string) {
 	const specialMiddleSignal = "<special-middle>"
+	// 标记所在行及其前后各2行，即前缀末尾3行和后缀开头3行，直接截取，无需拼接并切分整个文件
+	// 前后缀本身含有标记时（极少见）仍按完整代码定位
+	if !strings.Contains(prefix, specialMiddleSignal) && !strings.Contains(suffix, specialMiddleSignal) {
+		return LastLines(prefix, 3), firstLines(suffix, 3)
+	}
+
 	code := prefix + specialMiddleSignal + suffix
 	lineNum, _ := getChoicesTextLineNumber(code, specialMiddleSignal)
 
@@ -158,6 +213,32 @@ func (t *SimpleParser) ExtractAccurateBlockPrefixSuffix(prefix, suffix string) (
 	return prefix, suffix
 }
 
+// LastLines 返回text的最后n行（不足n行时返回全部）
+func LastLines(text string, n int) string {
+	end := len(text)
+	for i := 0; i < n; i++ {
+		j := strings.LastIndexByte(text[:end], '\n')
+		if j < 0 {
+			return text
+		}
+		end = j
+	}
+	return text[end+1:]
+}
+
+// firstLines 返回text的前n行（不足n行时返回全部）
+func firstLines(text string, n int) string {
+	start := 0
+	for i := 0; i < n; i++ {
+		j := strings.IndexByte(text[start:], '\n')
+		if j < 0 {
+			return text
+		}
+		start += j + 1
+	}
+	return text[:start-1]
+}
+
 /**
  * 查找最近的代码块（简化实现）
  * @param {string} code - 完整的代码字符串，用于查找代码块
@@ -287,38 +368,43 @@ func (t *SimpleParser) GetLastKLineStrLen(code string, k int) int {
  * // isValid = true
  */
 func (t *SimpleParser) checkPythonSyntax(code string) bool {
-	lines := strings.Split(code, "\n")
 	indentStack := []int{0}
 
-	for _, line := range lines {
-		trimmed := strings.TrimSpace(line)
-		if trimmed == "" {
-			continue
+	// 逐行前移，不切分整个代码；每行只扫描一次缩进，冒号判断只做一次
+	for rest := code; ; {
+		line := rest
+		i := strings.IndexByte(rest, '\n')
+		if i >= 0 {
+			line, rest = rest[:i], rest[i+1:]
 		}
 
 		// 计算当前行的缩进级别
 		currentIndent := 0
-		for _, char := range line {
-			if char == ' ' || char == '\t' {
-				currentIndent++
-			} else {
-				break
-			}
+		for currentIndent < len(line) && (line[currentIndent] == ' ' || line[currentIndent] == '\t') {
+			currentIndent++
 		}
+		trimmed := strings.TrimSpace(line[currentIndent:])
+		if trimmed != "" {
+			opensBlock := trimmed[len(trimmed)-1] == ':'
 
-		// 检查缩进是否合理
-		if currentIndent > indentStack[len(indentStack)-1] && !strings.HasSuffix(trimmed, ":") {
-			return false
-		}
+			// 检查缩进是否合理
+			if currentIndent > indentStack[len(indentStack)-1] && !opensBlock {
+				return false
+			}
 
-		// 更新缩进栈
-		if strings.HasSuffix(trimmed, ":") {
-			indentStack = append(indentStack, currentIndent+4)
-		} else {
-			for len(indentStack) > 1 && currentIndent <= indentStack[len(indentStack)-2] {
-				indentStack = indentStack[:len(indentStack)-1]
+			// 更新缩进栈
+			if opensBlock {
+				indentStack = append(indentStack, currentIndent+4)
+			} else {
+				for len(indentStack) > 1 && currentIndent <= indentStack[len(indentStack)-2] {
+					indentStack = indentStack[:len(indentStack)-1]
+				}
 			}
 		}
+
+		if i < 0 {
+			break
+		}
 	}
 
 	return true
@@ -339,37 +425,7 @@ func (t *SimpleParser) checkPythonSyntax(code string) bool {
  * // isValid = true
  */
 func (t *SimpleParser) checkJavaScriptSyntax(code string) bool {
-	bracketCount := 0
-	parenCount := 0
-	bracketSquareCount := 0
-
-	for _, char := range code {
-		switch char {
-		case '{':
-			bracketCount++
-		case '}':
-			bracketCount--
-			if bracketCount < 0 {
-				return false
-			}
-		case '(':
-			parenCount++
-		case ')':
-			parenCount--
-			if parenCount < 0 {
-				return false
-			}
-		case '[':
-			bracketSquareCount++
-		case ']':
-			bracketSquareCount--
-			if bracketSquareCount < 0 {
-				return false
-			}
-		}
-	}
-
-	return bracketCount == 0 && parenCount == 0 && bracketSquareCount == 0
+	return isBracketsBalanced(code)
 }
 
 /**
@@ -387,12 +443,27 @@ func (t *SimpleParser) checkJavaScriptSyntax(code string) bool {
  * // isValid = true
  */
 func (t *SimpleParser) checkGoSyntax(code string) bool {
+	return isBracketsBalanced(code)
+}
+
+/**
+ * 检查三种括号是否成对匹配
+ * @param {string} code - 需要检查的代码字符串
+ * @returns {boolean} 返回括号是否匹配
+ * @description
+ * - 括号均为ASCII字符，UTF-8多字节字符的各字节都不会与之相等，因此按字节扫描，无需解码rune
+ * - 任一类型的右括号多于左括号时立即返回false
+ * @example
+ * isValid := isBracketsBalanced("func test() { return }")
+ * // isValid = true
+ */
+func isBracketsBalanced(code string) bool {
 	bracketCount := 0
 	parenCount := 0
 	bracketSquareCount := 0
 
-	for _, char := range code {
-		switch char {
+	for i := 0; i < len(code); i++ {
+		switch code[i] {
 		case '{':
 			bracketCount++
 		case '}':
@@ -435,20 +506,31 @@ func (t *SimpleParser) checkGoSyntax(code string) bool {
  * // start = 1, end = 3
  */
 func getChoicesTextLineNumber(code, pattern string) (int, int) {
-	codeSplit := strings.Split(code, "\n")
 	startNumber := 0
 	endNumber := 0
 
-	for i := range codeSplit {
-		if strings.Contains(codeSplit[i], pattern) && startNumber == 0 {
-			startNumber = i
-			continue
+	// 直接在整段代码中查找模式，按两次匹配之间的换行数累加行号，不切分行
+	line := 0
+	for rest := code; ; {
+		i := strings.Index(rest, pattern)
+		if i < 0 {
+			break
+		}
+		line += strings.Count(rest[:i], "\n")
+		if startNumber == 0 {
+			startNumber = line
+		} else {
+			endNumber = line
+			break
 		}
 
-		if strings.Contains(codeSplit[i], pattern) && startNumber != 0 {
-			endNumber = i
+		// 同一行只计一次，跳到下一行继续查找
+		nl := strings.IndexByte(rest[i:], '\n')
+		if nl < 0 {
 			break
 		}
+		rest = rest[i+nl+1:]
+		line++
 	}
 
 	return startNumber, endNumber
@@ -460,7 +542,7 @@ func getChoicesTextLineNumber(code, pattern string) (int, int) {
  * @param {string} pattern - 用于分离前后缀的模式字符串
  * @returns {string, string} 返回分离后的前缀和后缀字符串
  * @description
- * - 使用模式字符串将代码分割成多个部分
+ * - 按模式字符串定位第一个和最后一个分隔位置，不生成中间部分
  * - 第一部分作为前缀，最后一部分作为后缀
  * - 如果代码为空，返回空字符串
  * - 如果分割部分不足，返回空字符串
@@ -473,12 +555,23 @@ func isolatedPrefixSuffix(code, pattern string) (string, string) {
 		return "", ""
 	}
 
-	split := strings.Split(code, pattern)
-	if len(split) >= 2 {
+	if pattern == "" {
+		split := strings.Split(code, pattern)
 		return split[0], split[len(split)-1]
 	}
 
-	return "", ""
+	// 第一个模式之前为前缀，最后一个（不重叠的）模式之后为后缀
+	prefix, rest, found := strings.Cut(code, pattern)
+	if !found {
+		return "", ""
+	}
+	for {
+		i := strings.Index(rest, pattern)
+		if i < 0 {
+			return prefix, rest
+		}
+		rest = rest[i+len(pattern):]
+	}
 }
 
 /**
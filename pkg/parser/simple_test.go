@@ -0,0 +1,139 @@
+package parser
+
+import (
+	"strings"
+	"testing"
+)
+
+func Test_getChoicesTextLineNumber(t *testing.T) {
+	const pattern = "<special-middle>"
+	cases := []struct {
+		code       string
+		start, end int
+	}{
+		{"line1\n<special-middle>\nline3\n<special-middle>", 1, 3},
+		{"a<special-middle>b<special-middle>c\nd", 0, 0},
+		{"x\ny<special-middle>z<special-middle>\nw\n<special-middle>", 1, 3},
+		{"<special-middle>\n<special-middle>\n<special-middle>", 1, 2},
+		{"no pattern\nhere", 0, 0},
+	}
+	for _, c := range cases {
+		start, end := getChoicesTextLineNumber(c.code, pattern)
+		if start != c.start || end != c.end {
+			t.Errorf("getChoicesTextLineNumber(%q) = (%d, %d), want (%d, %d)", c.code, start, end, c.start, c.end)
+		}
+	}
+}
+
+func Test_isolatedPrefixSuffix(t *testing.T) {
+	cases := []struct {
+		code, pattern  string
+		prefix, suffix string
+	}{
+		{"prefix<middle>content<middle>suffix", "<middle>", "prefix", "suffix"},
+		{"prefix<middle>suffix", "<middle>", "prefix", "suffix"},
+		{"no pattern", "<middle>", "", ""},
+		{"", "<middle>", "", ""},
+		{"MM\nMMMa", "MM", "", "Ma"},
+	}
+	for _, c := range cases {
+		prefix, suffix := isolatedPrefixSuffix(c.code, c.pattern)
+		if prefix != c.prefix || suffix != c.suffix {
+			t.Errorf("isolatedPrefixSuffix(%q, %q) = (%q, %q), want (%q, %q)", c.code, c.pattern, prefix, suffix, c.prefix, c.suffix)
+		}
+	}
+}
+
+func Test_IsCodeSyntaxBrackets(t *testing.T) {
+	cases := []struct {
+		language string
+		code     string
+		want     bool
+	}{
+		{"go", "func test() { return }", true},
+		{"Go", "func test() { s := \"中文(\"", false},
+		{"javascript", "const a = [1, 2]; f(a)", true},
+		{"typescript", "f(a))", false},
+		{"unknown", "((", true},
+	}
+	for _, c := range cases {
+		if got := GetSimpleParser(c.language).IsCodeSyntax(c.code); got != c.want {
+			t.Errorf("IsCodeSyntax(%q, %q) = %v, want %v", c.language, c.code, got, c.want)
+		}
+	}
+}
+
+func Test_checkPythonSyntax(t *testing.T) {
+	cases := []struct {
+		code string
+		want bool
+	}{
+		{"if True:\n    print('Hello')", true},
+		{"def f():\n    return 1\nx = f()", true},
+		{"x = 1\n    y = 2", false},
+		{"\n\n  \t\n", true},
+		{"for i in range(3):\r\n    pass\r\n", true},
+	}
+	p := &SimpleParser{}
+	for _, c := range cases {
+		if got := p.checkPythonSyntax(c.code); got != c.want {
+			t.Errorf("checkPythonSyntax(%q) = %v, want %v", c.code, got, c.want)
+		}
+	}
+}
+
+func Test_InterceptSyntaxErrorCodeUnchecked(t *testing.T) {
+	cases := []struct {
+		choices, want string
+	}{
+		{"", ""},
+		{"foo(1)\n\n", "foo(1)"},
+		{"bar = [1, 2 \t", "bar = [1, 2"},
+		{" \n\t", " \n\t"},
+	}
+	p := GetSimpleParser("rust")
+	for _, c := range cases {
+		if got := p.InterceptSyntaxErrorCode(c.choices, "fn main() {\n", "\n}"); got != c.want {
+			t.Errorf("InterceptSyntaxErrorCode(%q) = %q, want %q", c.choices, got, c.want)
+		}
+	}
+}
+
+// accurateBlockPrefixSuffixReference 按完整代码定位标记行的原实现，作为ExtractAccurateBlockPrefixSuffix的对照
+func accurateBlockPrefixSuffixReference(prefix, suffix string) (string, string) {
+	const specialMiddleSignal = "<special-middle>"
+	code := prefix + specialMiddleSignal + suffix
+	lineNum, _ := getChoicesTextLineNumber(code, specialMiddleSignal)
+
+	lines := strings.Split(code, "\n")
+	if lineNum >= 0 && lineNum < len(lines) {
+		startLine := max(0, lineNum-2)
+		endLine := min(len(lines), lineNum+3)
+		return isolatedPrefixSuffix(strings.Join(lines[startLine:endLine], "\n"), specialMiddleSignal)
+	}
+	return prefix, suffix
+}
+
+func FuzzExtractAccurateBlockPrefixSuffix(f *testing.F) {
+	seeds := []struct{ prefix, suffix string }{
+		{"def main():\n    x = 1\n    y", " = 2\n    return y\n\nmain()"},
+		{"", ""},
+		{"a\nb\nc\nd", "e\nf\ng\nh"},
+		{"\n\n", "\n"},
+		{"one line", "tail"},
+		{"x<special-middle>y\nz", "w"},
+		{"a\r\nb\r\n", "\r\nc"},
+	}
+	for _, s := range seeds {
+		f.Add(s.prefix, s.suffix)
+	}
+	p := &SimpleParser{}
+	f.Fuzz(func(t *testing.T, prefix, suffix string) {
+		gotPrefix, gotSuffix := p.ExtractAccurateBlockPrefixSuffix(prefix, suffix)
+		wantPrefix, wantSuffix := accurateBlockPrefixSuffixReference(prefix, suffix)
+		if gotPrefix != wantPrefix || gotSuffix != wantSuffix {
+			t.Errorf("ExtractAccurateBlockPrefixSuffix(%q, %q) = (%q, %q), want (%q, %q)",
+				prefix, suffix, gotPrefix, gotSuffix, wantPrefix, wantSuffix)
+		}
+	})
+}
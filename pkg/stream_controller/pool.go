@@ -6,7 +6,6 @@ import (
 	"code-completion/pkg/metrics"
 	"code-completion/pkg/model"
 	"context"
-	"fmt"
 	"sync"
 	"time"
 
@@ -21,6 +20,13 @@ type ModelPool struct {
 	mutex    sync.RWMutex
 	waits    chan *ClientRequest
 	runnings map[string]*ClientRequest
+	workers  sync.Once // 处理协程在该池收到第一个请求时才启动
+}
+
+// 模型池协程返回的模型原始结果，修剪等后处理由等待该请求的协程完成
+type poolResult struct {
+	handler *completions.CompletionHandler
+	result  *completions.LLMResult
 }
 
 // 模型请求池管理器
@@ -62,11 +68,6 @@ func (m *PoolManager) initPool(model string, llm model.LLM, cfg *config.ModelCon
 	}
 	m.all = append(m.all, pool)
 
-	// 启动MaxConcurrent个协程处理请求
-	for i := 0; i < cfg.MaxConcurrent; i++ {
-		go m.LoopDoRequest(pool)
-	}
-
 	// 将池添加到对应的模型名下
 	if _, exists := m.pools[model]; !exists {
 		m.pools[model] = make([]*ModelPool, 0)
@@ -87,6 +88,15 @@ func (m *PoolManager) initPool(model string, llm model.LLM, cfg *config.ModelCon
 	return pool
 }
 
+// startWorkers 首次使用模型池时启动MaxConcurrent个协程处理请求，从未被选中的池不占用协程
+func (m *PoolManager) startWorkers(pool *ModelPool) {
+	pool.workers.Do(func() {
+		for i := 0; i < pool.cfg.MaxConcurrent; i++ {
+			go m.LoopDoRequest(pool)
+		}
+	})
+}
+
 /**
 * Find the model pool with the lowest load rate from a list of pools
 * @param {[]*ModelPool} pools - List of model pools to search
@@ -141,16 +151,19 @@ func (m *PoolManager) WaitDoRequest(req *ClientRequest) *completions.CompletionR
 	pool := m.SelectIdlestPool(req.Para.Model)
 	if pool == nil {
 		req.Canceled = true
-		return completions.CancelRequest(req.Para.CompletionID, req.Para.Model, req.Perf, model.StatusBusy, fmt.Errorf("model pool busy, request rejected"))
+		return completions.CancelRequest(req.Para.CompletionID, req.Para.Model, req.Perf, model.StatusBusy, errPoolRejected)
 	}
 	req.Para.Model = pool.cfg.ModelName
+	m.startWorkers(pool)
 	// 尝试将请求发送到ModelPool的waits通道，如果不能立即发送则失败
 	select {
 	case pool.waits <- req: // 成功将请求发送到waits通道
 		// 等待请求处理完成,接收处理结果
 		select {
-		case rsp := <-req.rspChan:
-			return rsp
+		case r := <-req.rspChan:
+			// 后处理在当前协程进行，不占用模型池的并发槽位
+			c := completions.NewCompletionContext(req.ctx, req.Perf)
+			return r.handler.Postprocess(c, req.Para, r.result)
 		case <-req.ctx.Done():
 			status := model.StatusTimeout
 			if req.ctx.Err() == context.Canceled {
@@ -167,7 +180,7 @@ func (m *PoolManager) WaitDoRequest(req *ClientRequest) *completions.CompletionR
 		req.Perf.QueueDuration = time.Since(req.Perf.EnqueueTime).Milliseconds()
 		req.Canceled = true
 		return completions.CancelRequest(req.Para.CompletionID, req.Para.Model, req.Perf, model.StatusBusy,
-			fmt.Errorf("model pool busy, request rejected"))
+			errPoolRejected)
 	}
 }
 
@@ -176,13 +189,15 @@ func (m *PoolManager) LoopDoRequest(pool *ModelPool) {
 	for {
 		// 从waits通道获取请求
 		req := <-pool.waits
-		if req == nil || req.Canceled {
+		// 排队期间被同一客户端的新请求取代或已超时的请求，上下文已结束，直接丢弃，不再调用模型
+		// 用户快速连续输入时，积压的旧请求由此合并为最新的一个
+		if req == nil || req.ctx.Err() != nil {
 			continue
 		}
-		rsp := m.doRequest(pool, req)
+		r := m.doRequest(pool, req)
 		// 将结果发送回请求的响应通道
 		select {
-		case req.rspChan <- rsp:
+		case req.rspChan <- r:
 		default:
 			zap.L().Error("Failed to send response to client",
 				zap.String("completionID", req.Para.CompletionID))
@@ -190,8 +205,8 @@ func (m *PoolManager) LoopDoRequest(pool *ModelPool) {
 	}
 }
 
-// 执行请求，调用补全模型
-func (m *PoolManager) doRequest(pool *ModelPool, req *ClientRequest) *completions.CompletionResponse {
+// 执行请求，调用补全模型，只在等待模型期间占用并发槽位
+func (m *PoolManager) doRequest(pool *ModelPool, req *ClientRequest) *poolResult {
 	req.Perf.QueueDuration = time.Since(req.Perf.EnqueueTime).Milliseconds()
 
 	// 增加活跃请求计数
@@ -205,7 +220,7 @@ func (m *PoolManager) doRequest(pool *ModelPool, req *ClientRequest) *completion
 	// 使用原有的补全处理器处理请求
 	handler := completions.NewCompletionHandler(pool.llm)
 	c := completions.NewCompletionContext(req.ctx, req.Perf)
-	rsp := handler.CallLLM(c, req.Para)
+	result := handler.RequestLLM(c, req.Para)
 
 	pool.mutex.Lock()
 	delete(pool.runnings, req.Para.CompletionID)
@@ -214,7 +229,7 @@ func (m *PoolManager) doRequest(pool *ModelPool, req *ClientRequest) *completion
 
 	metrics.UpdateCompletionConcurrentByModel(pool.cfg.ModelName, currentRequests)
 
-	return rsp
+	return &poolResult{handler: handler, result: result}
 }
 
 // 获取统计信息
@@ -21,20 +21,24 @@ type CompletionClient struct {
 	ClientID   string
 	Latest     *ClientRequest
 	LatestTime time.Time
+	LatestSeq  uint64 // 最新收到的请求序号，用于判断预处理中的请求是否已被取代
 }
 
 // 等待队列管理器
 type QueueManager struct {
-	clients  map[string]*CompletionClient
-	requests map[string]*ClientRequest
-	mutex    sync.RWMutex
+	clients   map[string]*CompletionClient
+	requests  map[uint64]*ClientRequest
+	activated int    // 有进行中请求的客户端数，随请求增删实时维护
+	nextKey   uint64 // 下一个请求的索引键，单调递增
+	nextSeq   uint64 // 下一个收到的请求序号，单调递增
+	mutex     sync.RWMutex
 }
 
 // 创建等待队列管理器
 func NewQueueManager() *QueueManager {
 	return &QueueManager{
 		clients:  make(map[string]*CompletionClient),
-		requests: make(map[string]*ClientRequest),
+		requests: make(map[uint64]*ClientRequest),
 	}
 }
 
@@ -47,37 +51,73 @@ func (m *QueueManager) AddRequest(ctx context.Context, para *model.CompletionPar
 		Canceled: false,
 		ctx:      reqCtx,
 		cancel:   cancel,
-		rspChan:  make(chan *completions.CompletionResponse, 1),
+		rspChan:  make(chan *poolResult, 1),
 	}
 	req.Perf.EnqueueTime = time.Now().Local()
 
 	m.mutex.Lock()
 	defer m.mutex.Unlock()
 
-	client, exists := m.clients[para.ClientID]
-	if !exists {
-		client = &CompletionClient{
-			ClientID: para.ClientID,
-		}
-		m.clients[para.ClientID] = client
-	}
+	client := m.getClient(para.ClientID)
 	client.LatestTime = req.Perf.ReceiveTime
 	if client.Latest != nil {
 		m.cancelRequest(client.Latest)
 		client.Latest = nil
+	} else {
+		m.activated++
 	}
 	client.Latest = req
 
-	m.requests[para.ClientID+para.CompletionID] = req
+	m.nextKey++
+	req.key = m.nextKey
+	m.requests[req.key] = req
 	metrics.UpdateCompletionConcurrent(len(m.requests))
 	return req
 }
 
+// 获取客户端，不存在则创建，调用方需持有写锁
+func (m *QueueManager) getClient(clientID string) *CompletionClient {
+	client, exists := m.clients[clientID]
+	if !exists {
+		client = &CompletionClient{
+			ClientID: clientID,
+		}
+		m.clients[clientID] = client
+	}
+	return client
+}
+
+// 记录客户端收到了新请求，返回该请求的序号
+// 同时更新客户端的活动时间，预处理期间的客户端不会被Cleanup当作过期客户端清理
+func (m *QueueManager) ReceiveRequest(clientID string, receiveTime time.Time) uint64 {
+	m.mutex.Lock()
+	defer m.mutex.Unlock()
+
+	m.nextSeq++
+	client := m.getClient(clientID)
+	client.LatestSeq = m.nextSeq
+	client.LatestTime = receiveTime
+	return m.nextSeq
+}
+
+// 判断请求是否已被同一客户端之后收到的请求取代
+// 用户连续输入时会密集发出请求，只有最新的请求需要继续调用模型
+func (m *QueueManager) IsSuperseded(clientID string, seq uint64) bool {
+	m.mutex.RLock()
+	defer m.mutex.RUnlock()
+
+	client, exists := m.clients[clientID]
+	return exists && client.LatestSeq != seq
+}
+
 func (m *QueueManager) RemoveRequest(req *ClientRequest) {
+	// 请求已结束，释放超时上下文的定时器，不必等到超时触发
+	req.cancel()
+
 	m.mutex.Lock()
 	defer m.mutex.Unlock()
 
-	delete(m.requests, req.Para.ClientID+req.Para.CompletionID)
+	delete(m.requests, req.key)
 	metrics.UpdateCompletionConcurrent(len(m.requests))
 
 	queue, exists := m.clients[req.Para.ClientID]
@@ -86,6 +126,7 @@ func (m *QueueManager) RemoveRequest(req *ClientRequest) {
 	}
 	if queue.Latest == req {
 		queue.Latest = nil
+		m.activated--
 	}
 }
 
@@ -102,18 +143,27 @@ func (m *QueueManager) cancelRequest(req *ClientRequest) {
 
 // 清理过期的队列
 func (m *QueueManager) Cleanup() {
-	m.mutex.Lock()
-	defer m.mutex.Unlock()
+	// 持锁期间只摘除客户端，日志在释放锁后输出，避免清理时长时间阻塞新请求入队
+	var removed []*CompletionClient
 
+	m.mutex.Lock()
 	// 清理长时间没有活动的客户端
 	currentTime := time.Now()
 	for _, client := range m.clients {
 		if currentTime.Sub(client.LatestTime) > config.Config.StreamController.CleanOlderThan {
+			if client.Latest != nil {
+				m.activated--
+			}
 			delete(m.clients, client.ClientID)
-			zap.L().Info("Removed client", zap.String("clientID", client.ClientID),
-				zap.Time("latestTime", client.LatestTime))
+			removed = append(removed, client)
 		}
 	}
+	m.mutex.Unlock()
+
+	for _, client := range removed {
+		zap.L().Info("Removed client", zap.String("clientID", client.ClientID),
+			zap.Time("latestTime", client.LatestTime))
+	}
 }
 
 // 获取统计信息
@@ -121,18 +171,12 @@ func (m *QueueManager) GetStats() map[string]interface{} {
 	m.mutex.RLock()
 	defer m.mutex.RUnlock()
 
-	activatedClient := 0
-	for _, client := range m.clients {
-		if client.Latest != nil {
-			activatedClient++
-		}
-	}
 	stats := make(map[string]interface{})
 	stats["requests"] = map[string]interface{}{
 		"total": len(m.requests),
 	}
 	stats["clients"] = map[string]interface{}{
-		"activated": activatedClient,
+		"activated": m.activated,
 		"total":     len(m.clients),
 	}
 
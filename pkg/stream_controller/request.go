@@ -9,26 +9,21 @@ import (
 
 // 客户端请求包装器
 type ClientRequest struct {
-	Para     *model.CompletionParameter           // 补全请求参数
-	Perf     *completions.CompletionPerformance   // 性能统计
-	Canceled bool                                 // 请求是否被取消
-	ctx      context.Context                      // 请求关联的协程上下文
-	cancel   context.CancelFunc                   // 可以取消执行请求的协程
-	rspChan  chan *completions.CompletionResponse // 响应通道
+	Para     *model.CompletionParameter         // 补全请求参数
+	Perf     *completions.CompletionPerformance // 性能统计
+	Canceled bool                               // 请求是否被取消
+	ctx      context.Context                    // 请求关联的协程上下文
+	cancel   context.CancelFunc                 // 可以取消执行请求的协程
+	rspChan  chan *poolResult                   // 模型结果通道
+	key      uint64                             // 等待队列中的索引键，入队时由计数器分配
 }
 
 func (r *ClientRequest) GetDetails() map[string]interface{} {
-	var linePrefix, lineSuffix string
-	lines := strings.Split(r.Para.Prefix, "\n")
-	if len(lines) > 0 {
-		linePrefix = lines[len(lines)-1]
-	}
-	lines = strings.Split(r.Para.Suffix, "\n")
-	if len(lines) > 0 {
-		lineSuffix = lines[0]
-		if len(lines) > 1 {
-			lineSuffix += "\n"
-		}
+	// 只取光标所在行，不切分整个前缀/后缀
+	linePrefix := r.Para.Prefix[strings.LastIndexByte(r.Para.Prefix, '\n')+1:]
+	lineSuffix := r.Para.Suffix
+	if i := strings.IndexByte(lineSuffix, '\n'); i >= 0 {
+		lineSuffix = lineSuffix[:i+1]
 	}
 	return map[string]interface{}{
 		"completion_id": r.Para.CompletionID,
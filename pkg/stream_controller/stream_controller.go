@@ -5,7 +5,7 @@ import (
 	"code-completion/pkg/config"
 	"code-completion/pkg/model"
 	"context"
-	"fmt"
+	"errors"
 	"time"
 
 	"go.uber.org/zap"
@@ -14,6 +14,14 @@ import (
 // 全局流控管理器
 var Controller *StreamController
 
+// 拒绝或取消请求时返回的固定错误，只创建一次，各请求共用
+var (
+	errMissingID    = errors.New("missing client id or completion id")
+	errPoolBusy     = errors.New("model pool busy, cancel request")
+	errPoolRejected = errors.New("model pool busy, request rejected")
+	errSuperseded   = errors.New("superseded by a newer request")
+)
+
 // 流控管理器,对补全模型的访问做流控，防止补全模型失去响应
 type StreamController struct {
 	queues *QueueManager //请求等待队列管理（在等待调度到模型请求池）
@@ -49,23 +57,28 @@ func (sc *StreamController) ProcessCompletionV1(ctx context.Context, input *comp
 	perf.ReceiveTime = time.Now().Local()
 	// 如果无法获取到clientID和completionID，拒掉
 	if input.ClientID == "" || input.CompletionID == "" {
-		return completions.CancelRequest(input.CompletionID, input.Model, &perf, model.StatusRejected, fmt.Errorf("missing client id or completion id"))
+		return completions.CancelRequest(input.CompletionID, input.Model, &perf, model.StatusRejected, errMissingID)
 	}
 	//	预选模型池
 	pool := sc.pools.SelectIdlestPool(input.Model)
 	if pool == nil {
-		return completions.CancelRequest(input.CompletionID, input.Model, &perf, model.StatusBusy, fmt.Errorf("model pool busy, cancel request"))
+		return completions.CancelRequest(input.CompletionID, input.Model, &perf, model.StatusBusy, errPoolBusy)
 	}
 	input.Model = pool.cfg.ModelName
+	seq := sc.queues.ReceiveRequest(input.ClientID, perf.ReceiveTime)
 
 	//	上下文预处理
+	handler := completions.NewCompletionHandler(pool.llm)
 	c := completions.NewCompletionContext(ctx, &perf)
-	rsp := input.Preprocess(c)
+	rsp := input.Preprocess(c, handler)
 	if rsp != nil {
 		return rsp
 	}
+	//	预处理期间该客户端已发出更新的请求，本请求无需再排队调用模型
+	if sc.queues.IsSuperseded(input.ClientID, seq) {
+		return completions.CancelRequest(input.CompletionID, input.Model, &perf, model.StatusCanceled, errSuperseded)
+	}
 	//	请求数据针对模型进行适应性改造
-	handler := completions.NewCompletionHandler(pool.llm)
 	para := handler.Adapt(input)
 
 	// 将请求添加到客户端队列，获取包含响应通道的ClientRequest
@@ -119,7 +132,7 @@ func (sc *StreamController) ProcessCompletionOpenAI(ctx context.Context, r *mode
 
 	pool := sc.pools.findIdlestPool(sc.pools.all)
 	if pool == nil {
-		return completions.CancelRequest("", r.Model, &perf, model.StatusBusy, fmt.Errorf("model pool busy, cancel request"))
+		return completions.CancelRequest("", r.Model, &perf, model.StatusBusy, errPoolBusy)
 	}
 	handler := completions.NewCompletionHandler(pool.llm)
 	c := completions.NewCompletionContext(ctx, &perf)
@@ -1,8 +1,11 @@
 package tokenizers
 
 import (
+	"container/list"
 	"fmt"
 	"os"
+	"strings"
+	"sync"
 
 	"github.com/sugarme/tokenizer"
 	"github.com/sugarme/tokenizer/pretrained"
@@ -11,6 +14,53 @@ import (
 // Tokenizer wraps sugarme/tokenizer library, providing a unified interface
 type Tokenizer struct {
 	tokenizer *tokenizer.Tokenizer
+	encoded   encodeCache // recent EncodeCached results
+}
+
+// encodeCacheSize bounds the number of texts kept by EncodeCached
+const encodeCacheSize = 64
+
+// encodedText pairs a text with its token IDs
+type encodedText struct {
+	text string
+	ids  []int
+}
+
+// encodeCache is a small LRU cache from text to token IDs
+type encodeCache struct {
+	mutex sync.Mutex
+	order *list.List               // most recently used at the front
+	items map[string]*list.Element // values are *encodedText
+}
+
+func (c *encodeCache) get(text string) ([]int, bool) {
+	c.mutex.Lock()
+	defer c.mutex.Unlock()
+	elem, ok := c.items[text]
+	if !ok {
+		return nil, false
+	}
+	c.order.MoveToFront(elem)
+	return elem.Value.(*encodedText).ids, true
+}
+
+func (c *encodeCache) put(text string, ids []int) {
+	c.mutex.Lock()
+	defer c.mutex.Unlock()
+	if c.items == nil {
+		c.order = list.New()
+		c.items = make(map[string]*list.Element, encodeCacheSize)
+	}
+	if elem, ok := c.items[text]; ok {
+		c.order.MoveToFront(elem)
+		return
+	}
+	c.items[text] = c.order.PushFront(&encodedText{text: text, ids: ids})
+	if c.order.Len() > encodeCacheSize {
+		oldest := c.order.Back()
+		c.order.Remove(oldest)
+		delete(c.items, oldest.Value.(*encodedText).text)
+	}
 }
 
 // NewTokenizer creates a new tokenizer instance
@@ -49,6 +99,18 @@ func (t *Tokenizer) Encode(text string) []int {
 	return encoding.GetIds()
 }
 
+// EncodeCached encodes text like Encode, but reuses the token IDs of one of
+// the most recent EncodeCached calls when the same text was seen before.
+// The returned slice is shared between callers and must not be modified.
+func (t *Tokenizer) EncodeCached(text string) []int {
+	if ids, ok := t.encoded.get(text); ok {
+		return ids
+	}
+	ids := t.Encode(text)
+	t.encoded.put(text, ids)
+	return ids
+}
+
 // Decode decodes token IDs back to text
 func (t *Tokenizer) Decode(ids []int) string {
 	return t.tokenizer.Decode(ids, true)
@@ -74,32 +136,16 @@ func (t *Tokenizer) GetTokens(text string) []int {
 // ConvertNLToLinux converts Windows newlines to Linux newlines
 func ConvertNLToLinux(s string) string {
 	// Replace Windows CRLF with Linux LF
-	result := s
-	for i := 0; i < len(result); i++ {
-		if result[i] == '\r' && i+1 < len(result) && result[i+1] == '\n' {
-			result = result[:i] + result[i+1:]
-		}
-	}
-	return result
+	return strings.ReplaceAll(s, "\r\n", "\n")
 }
 
+// nlToWinReplacer keeps existing CRLF as-is and expands bare LF, in a single pass
+var nlToWinReplacer = strings.NewReplacer("\r\n", "\r\n", "\n", "\r\n")
+
 // ConvertNLToWin converts Linux newlines to Windows newlines
 func ConvertNLToWin(s string) string {
-	// Replace Linux LF with Windows CRLF
-	result := ""
-	for i := 0; i < len(s); i++ {
-		if s[i] == '\n' {
-			// Check if it's not already a CRLF
-			if i == 0 || s[i-1] != '\r' {
-				result += "\r\n"
-			} else {
-				result += "\n"
-			}
-		} else {
-			result += string(s[i])
-		}
-	}
-	return result
+	// CRLF is matched before LF, so existing CRLF is not doubled
+	return nlToWinReplacer.Replace(s)
 }
 
 // Close releases resources
@@ -182,6 +182,42 @@ func Test_GetTokens(t *testing.T) {
 	}
 }
 
+func Test_EncodeCached(t *testing.T) {
+	// Get absolute path to the tokenizer file
+	wd, err := os.Getwd()
+	if err != nil {
+		t.Error("Failed to get working directory:", err)
+		return
+	}
+
+	// Navigate from pkg/tokenizers to project root
+	projectRoot := filepath.Dir(filepath.Dir(wd))
+	tokenizerPath := filepath.Join(projectRoot, "bin/deepseek-tokenizer/tokenizer.json")
+
+	tk, err := NewTokenizer(tokenizerPath)
+	if err != nil {
+		t.Error(err)
+		return
+	}
+	defer tk.Close()
+
+	// Cached encoding must match Encode, both on first call and on reuse
+	for _, text := range []string{"func a() {}", "func a() {}", "func b() {}", ""} {
+		cached := tk.EncodeCached(text)
+		encoded := tk.Encode(text)
+		if len(cached) != len(encoded) {
+			t.Errorf("EncodeCached(%q) returned %d tokens, Encode returned %d", text, len(cached), len(encoded))
+			continue
+		}
+		for i := range cached {
+			if cached[i] != encoded[i] {
+				t.Errorf("EncodeCached(%q) differs from Encode at index %d", text, i)
+				break
+			}
+		}
+	}
+}
+
 func Test_ConvertNL(t *testing.T) {
 	// Test ConvertNLToLinux
 	winText := "Line 1\r\nLine 2\r\nLine 3"
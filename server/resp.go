@@ -9,6 +9,19 @@ import (
 	"go.uber.org/zap"
 )
 
+// 补全状态对应的HTTP状态码，未列出的状态按服务器内部错误处理
+var statusCodes = map[model.CompletionStatus]int{
+	model.StatusSuccess:     http.StatusOK,
+	model.StatusEmpty:       http.StatusNoContent,
+	model.StatusCanceled:    499, // Client Closed Request
+	model.StatusTimeout:     http.StatusGatewayTimeout,
+	model.StatusBusy:        http.StatusTooManyRequests,
+	model.StatusReqError:    http.StatusBadRequest,
+	model.StatusRejected:    http.StatusBadRequest,
+	model.StatusModelError:  http.StatusInternalServerError,
+	model.StatusServerError: http.StatusInternalServerError,
+}
+
 func respCompletion(c *gin.Context, clientId, ifId string, rsp *completions.CompletionResponse) {
 	if rsp.Status != model.StatusSuccess {
 		zap.L().Warn("completion failed", zap.String("completionID", rsp.ID),
@@ -22,23 +35,8 @@ func respCompletion(c *gin.Context, clientId, ifId string, rsp *completions.Comp
 			zap.String("if", ifId),
 			zap.Any("response", rsp))
 	}
-	statusCode := http.StatusOK
-	switch rsp.Status {
-	case model.StatusSuccess:
-		statusCode = http.StatusOK
-	case model.StatusEmpty:
-		statusCode = http.StatusNoContent
-	case model.StatusCanceled:
-		statusCode = 499 // Client Closed Request
-	case model.StatusTimeout:
-		statusCode = http.StatusGatewayTimeout
-	case model.StatusBusy:
-		statusCode = http.StatusTooManyRequests
-	case model.StatusReqError, model.StatusRejected:
-		statusCode = http.StatusBadRequest
-	case model.StatusModelError, model.StatusServerError:
-		statusCode = http.StatusInternalServerError
-	default:
+	statusCode, ok := statusCodes[rsp.Status]
+	if !ok {
 		statusCode = http.StatusInternalServerError
 	}
 	c.JSON(statusCode, rsp)
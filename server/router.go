@@ -142,6 +142,12 @@ func ginLogger() gin.HandlerFunc {
 		// 处理请求
 		c.Next()
 
+		// 未开启Debug级别时（release模式默认如此）不再收集和构造日志字段
+		ce := zap.L().Check(zap.DebugLevel, "HTTP Request")
+		if ce == nil {
+			return
+		}
+
 		// 记录日志
 		latency := time.Since(start)
 		clientIP := c.ClientIP()
@@ -149,7 +155,7 @@ func ginLogger() gin.HandlerFunc {
 		statusCode := c.Writer.Status()
 		bodySize := c.Writer.Size()
 
-		zap.L().Debug("HTTP Request", zap.Int("status", statusCode),
+		ce.Write(zap.Int("status", statusCode),
 			zap.String("method", method), zap.String("path", path),
 			zap.String("ip", clientIP), zap.Duration("latency", latency),
 			zap.Int("bodySize", bodySize),